@@ -0,0 +1,132 @@
+"""Load test: latency of a well-behaved airline while another one floods.
+
+A pool of coordinator workers is shared by all airlines. Airline XX sends
+far more bookings than the pool can serve; airline AA sends a steady
+trickle. Without admission control AA's bookings queue behind XX's. With
+it, XX is shed at arrival and AA's latency stays close to the baseline.
+
+Run from the repository root with:  python -m benchmarks.bench_admission_control
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+from global_object_factory import context, set_always
+
+from legacy_booking.admission_control import AdmissionController
+from legacy_booking.audit_logger_impl import AuditLoggerImpl
+from legacy_booking.booking_coordinator_impl import BookingCoordinatorImpl
+from legacy_booking.booking_rejected_exception import BookingRejectedException
+from legacy_booking.booking_repository_impl import BookingRepositoryImpl
+from legacy_booking.flight_availability_service import FlightAvailabilityService
+from legacy_booking.flight_availability_service_impl import FlightAvailabilityServiceImpl
+from legacy_booking.partner_notifier_impl import PartnerNotifierImpl
+from legacy_booking.retry_policy import get_shared_retry_metrics
+from tests.fakes import AuditLoggerStub, BookingRepositoryStub, PartnerNotifierStub
+
+WORKERS = 8
+SERVICE_TIME = 0.004  # Seconds spent in the availability database per booking
+DURATION = 2.0
+RATES = {"AA": 100, "XX": 3000}  # Bookings per second while flooding
+DEPARTURE = datetime(2025, 7, 3)
+
+
+class SlowAvailabilityService(FlightAvailabilityService):
+    """Availability database with a fixed query time."""
+
+    def check_and_get_available_seats_for_booking(
+        self, flight_number: str, departure_date: datetime, passenger_count: int
+    ) -> List[str]:
+        time.sleep(SERVICE_TIME)
+        return ["1A", "1B", "1C", "1D"]
+
+    def is_flight_fully_booked(self, flight_number: str, departure_date: datetime) -> bool:
+        return False
+
+    def reserve_seats(
+        self, flight_number: str, departure_date: datetime, seat_labels: Sequence[str]
+    ) -> bool:
+        return True
+
+    def release_seats(
+        self, flight_number: str, departure_date: datetime, seat_labels: Sequence[str]
+    ) -> None:
+        pass
+
+
+def book(airline_code: str) -> None:
+    # A coordinator per booking is fine: retry budget and metrics are process-wide
+    coordinator = BookingCoordinatorImpl(datetime(2025, 6, 1))
+    coordinator.book_flight("John Doe", f"{airline_code}123", DEPARTURE, 2, airline_code)
+
+
+def run(rates: Dict[str, int], controller: Optional[AdmissionController]) -> List[float]:
+    """Drive arrivals at the given rates; return AA latencies in milliseconds."""
+    latencies: List[float] = []
+    lock = threading.Lock()
+    router = BookingCoordinatorImpl()  # Only used to look up downstream targets
+
+    def work(airline_code: str, arrived: float, ticket: object) -> None:
+        try:
+            book(airline_code)
+        finally:
+            if ticket is not None:
+                ticket.release()  # type: ignore[attr-defined]
+        if airline_code == "AA":
+            with lock:
+                latencies.append((time.perf_counter() - arrived) * 1e3)
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        start = time.perf_counter()
+        sent = {airline: 0 for airline in rates}
+        while (elapsed := time.perf_counter() - start) < DURATION:
+            for airline_code, rate in rates.items():
+                while sent[airline_code] < elapsed * rate:
+                    sent[airline_code] += 1
+                    ticket = None
+                    if controller is not None:
+                        targets = router.downstream_targets(f"{airline_code}123", airline_code)
+                        try:
+                            ticket = controller.admit(airline_code, targets)
+                        except BookingRejectedException:
+                            continue
+                    pool.submit(work, airline_code, time.perf_counter(), ticket)
+            time.sleep(0.0005)
+    return latencies
+
+
+def report(label: str, latencies: List[float]) -> None:
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[int(len(latencies) * 0.99)]
+    print(f"{label:<32} n={len(latencies):>4}  p50={p50:8.1f} ms  p99={p99:8.1f} ms")
+
+
+def main() -> None:
+    with context():
+        set_always(BookingRepositoryImpl, BookingRepositoryStub())
+        set_always(FlightAvailabilityServiceImpl, SlowAvailabilityService())
+        set_always(PartnerNotifierImpl, PartnerNotifierStub())
+        set_always(AuditLoggerImpl, AuditLoggerStub())
+
+        report("AA alone", run({"AA": RATES["AA"]}, None))
+        report("AA while XX floods, no control", run(RATES, None))
+
+        controller = AdmissionController(
+            airline_rate=500.0, airline_burst=50.0, target_concurrency=WORKERS // 2
+        )
+        report("AA while XX floods, admission", run(RATES, controller))
+        metrics = controller.metrics
+        print(
+            f"shed rate {metrics.shed_rate():.1%}, shed by airline {dict(metrics.shed_by_airline)}, "
+            f"peak in flight {dict(metrics.peak_in_flight)}"
+        )
+        retries = get_shared_retry_metrics()
+        print(f"retried {retries.retries} of {retries.calls} calls across all coordinators")
+
+
+if __name__ == "__main__":
+    main()
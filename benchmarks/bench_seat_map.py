@@ -0,0 +1,54 @@
+"""Benchmark group seat allocation on a fragmented 400-seat aircraft.
+
+Run with:  python benchmarks/bench_seat_map.py
+"""
+
+import random
+import timeit
+
+from legacy_booking.seat_map import SeatMap
+
+LAYOUT = "ABC DEFG HJK"
+ROWS = 40  # 40 rows x 10 seats = 400 seats
+OCCUPANCY = 0.6
+REPEAT = 500
+
+
+def fragmented_map(seed: int) -> SeatMap:
+    """Aircraft with roughly OCCUPANCY of its seats taken at random."""
+    rng = random.Random(seed)
+    seat_map = SeatMap(LAYOUT)
+    for row in range(1, ROWS + 1):
+        seat_map.add_row(row, free=True)
+        for letter in LAYOUT.replace(" ", ""):
+            if rng.random() < OCCUPANCY:
+                seat_map.mark_occupied(f"{row}{letter}")
+    return seat_map
+
+
+def main() -> None:
+    template = fragmented_map(seed=42)
+    print(f"{template.free_count()} free seats of {ROWS * 10} ({OCCUPANCY:.0%} occupied)")
+    print(f"{'group':>5} {'us/alloc':>10}  seats")
+
+    copy_time = timeit.timeit(template.copy, number=REPEAT)
+    for count in range(2, 41):
+        total = timeit.timeit(lambda: template.copy().allocate(count), number=REPEAT)
+        seats = template.copy().allocate(count)
+        rows = sorted({int(seat[:-1]) for seat in seats})
+        print(f"{count:>5} {(total - copy_time) / REPEAT * 1e6:>10.1f}  rows {rows[0]}-{rows[-1]}")
+
+    # Keep seating groups until the aircraft is full
+    rng = random.Random(7)
+    seat_map = fragmented_map(seed=42)
+    groups = 0
+    elapsed = 0.0
+    while seat_map.free_count():
+        count = min(rng.randint(2, 40), seat_map.free_count())  # Last group takes what is left
+        elapsed += timeit.timeit(lambda: seat_map.allocate(count), number=1)
+        groups += 1
+    print(f"filled aircraft with {groups} groups in {elapsed * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark warm restarts from a coordinator checkpoint journal.
+
+Measures how long a new coordinator takes to restore its state from a
+journal, and what journaling costs per booking.
+
+Run from the repository root with:  python -m benchmarks.bench_warm_start
+"""
+
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+from global_object_factory import context, set_always
+
+from legacy_booking.audit_logger_impl import AuditLoggerImpl
+from legacy_booking.booking_coordinator_impl import BookingCoordinatorImpl
+from legacy_booking.booking_repository_impl import BookingRepositoryImpl
+from legacy_booking.coordinator_checkpoint import CoordinatorCheckpoint
+from legacy_booking.flight_availability_service_impl import FlightAvailabilityServiceImpl
+from legacy_booking.partner_notifier_impl import PartnerNotifierImpl
+from tests.fakes import (
+    AuditLoggerStub,
+    BookingRepositoryStub,
+    FlightAvailabilityServiceStub,
+    PartnerNotifierStub,
+)
+
+BOOKINGS = 20000
+RESTARTS = 200
+
+
+def book(coordinator: BookingCoordinatorImpl, count: int) -> float:
+    """Book count flights; return seconds per booking."""
+    start = time.perf_counter()
+    for _ in range(count):
+        coordinator.book_flight("John Doe", "AA123", datetime(2025, 7, 3), 2, "AA")
+    return (time.perf_counter() - start) / count
+
+
+def main() -> None:
+    with context(), tempfile.TemporaryDirectory() as directory:
+        set_always(BookingRepositoryImpl, BookingRepositoryStub())
+        set_always(FlightAvailabilityServiceImpl, FlightAvailabilityServiceStub())
+        set_always(PartnerNotifierImpl, PartnerNotifierStub())
+        set_always(AuditLoggerImpl, AuditLoggerStub())
+
+        journal = os.path.join(directory, "coordinator.journal")
+        plain = book(BookingCoordinatorImpl(), BOOKINGS)
+        checkpointed = BookingCoordinatorImpl(checkpoint=CoordinatorCheckpoint(journal))
+        journaled = book(checkpointed, BOOKINGS)
+        print(f"per booking: {plain * 1e6:.1f} us plain, {journaled * 1e6:.1f} us journaled")
+
+        # Leave an uncompacted tail behind, as a crash would
+        print(f"journal size before restart: {os.path.getsize(journal)} bytes")
+
+        timings = []
+        for _ in range(RESTARTS):
+            start = time.perf_counter()
+            restored = BookingCoordinatorImpl(checkpoint=CoordinatorCheckpoint(journal))
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        print(
+            f"warm start: median {statistics.median(timings) * 1e3:.3f} ms, "
+            f"p99 {timings[int(len(timings) * 0.99)] * 1e3:.3f} ms "
+            f"(counter {restored.booking_counter} after {checkpointed.booking_counter})"
+        )
+
+
+if __name__ == "__main__":
+    main()
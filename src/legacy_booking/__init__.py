@@ -9,10 +9,12 @@ __version__ = "1.0.0"
 
 from .booking import Booking
 from .booking_coordinator_impl import BookingCoordinatorImpl
+from .booking_rejected_exception import BookingRejectedException
 from .can_not_use_in_tests_exception import CanNotUseInTestsException
 
 __all__ = [
     "Booking",
     "BookingCoordinatorImpl",
+    "BookingRejectedException",
     "CanNotUseInTestsException",
 ]
\ No newline at end of file
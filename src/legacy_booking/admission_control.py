@@ -0,0 +1,239 @@
+"""Admission control and load shedding in front of the booking coordinator.
+
+One airline's fare sale must not exhaust the workers and downstream
+systems (availability databases, partner SMTP hosts) every other airline
+depends on. Bookings over their airline's rate or over a target's
+concurrency cap are rejected immediately with a retry-after hint; nothing
+is queued.
+"""
+
+import math
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from enum import IntEnum
+from typing import Callable, Dict, Optional, Sequence
+
+from .booking import Booking, BookingChanges
+from .booking_coordinator_impl import BookingCoordinatorImpl
+from .booking_rejected_exception import BookingRejectedException
+
+
+class BookingPriority(IntEnum):
+    """Priority classes, most urgent first."""
+
+    REBOOKING = 0
+    STANDARD = 1
+
+
+class TokenBucket:
+    """Classic token bucket. NOTE: Callers must hold their own lock.
+
+    A rate of zero never refills, so once the burst is spent try_take
+    returns math.inf rather than a time to wait.
+    """
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float]) -> None:
+        if rate < 0:
+            raise ValueError(f"Token bucket rate must not be negative: {rate}")
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = burst
+        self._updated = clock()
+
+    def try_take(self) -> float:
+        """Take one token; return 0.0 on success, else seconds until one is available."""
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return 0.0
+        if self.rate == 0:
+            return math.inf
+        return (1.0 - self._tokens) / self.rate
+
+
+class AdmissionMetrics:
+    """Counters for admitted and shed bookings."""
+
+    def __init__(self) -> None:
+        self.admitted = 0
+        self.shed = 0
+        self.shed_by_airline: Dict[str, int] = defaultdict(int)
+        self.shed_by_reason: Dict[str, int] = defaultdict(int)
+        self.peak_in_flight: Dict[str, int] = defaultdict(int)
+
+    def shed_rate(self) -> float:
+        """Return the fraction of bookings rejected so far."""
+        total = self.admitted + self.shed
+        return self.shed / total if total else 0.0
+
+
+class AdmissionTicket:
+    """Holds a booking's downstream slots until it finishes."""
+
+    def __init__(self, controller: "AdmissionController", targets: Sequence[str]) -> None:
+        self._controller = controller
+        self._targets = targets
+        self._released = False
+
+    def release(self) -> None:
+        """Return the slots; safe to call more than once."""
+        if not self._released:
+            self._released = True
+            self._controller._release(self._targets)
+
+    def __enter__(self) -> "AdmissionTicket":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.release()
+
+
+class AdmissionController:
+    """Thread-safe admission decisions shared by all coordinator workers.
+
+    Standard bookings are limited by a per-airline token bucket and may only
+    use part of each target's concurrency; the rest is reserved for
+    rebookings, which also skip the rate limit. An airline configured with
+    a rate of zero is suspended: its standard bookings are rejected with
+    suspended_retry_after as the hint.
+    """
+
+    def __init__(
+        self,
+        airline_rate: float = 50.0,
+        airline_burst: float = 100.0,
+        target_concurrency: int = 16,
+        rebooking_reserve: float = 0.25,
+        busy_retry_after: float = 0.05,
+        airline_rates: Optional[Dict[str, float]] = None,
+        suspended_retry_after: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        for airline_code, rate in {"default": airline_rate, **(airline_rates or {})}.items():
+            if rate < 0:
+                raise ValueError(f"Negative booking rate for {airline_code}: {rate}")
+
+        self.airline_rate = airline_rate
+        self.airline_burst = airline_burst
+        self.target_concurrency = target_concurrency
+        self.standard_concurrency = max(1, int(target_concurrency * (1 - rebooking_reserve)))
+        self.busy_retry_after = busy_retry_after
+        self.airline_rates = airline_rates or {}
+        self.suspended_retry_after = suspended_retry_after
+        self.metrics = AdmissionMetrics()
+        self._clock = clock
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._in_flight: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def admit(
+        self,
+        airline_code: str,
+        targets: Sequence[str],
+        priority: BookingPriority = BookingPriority.STANDARD,
+    ) -> AdmissionTicket:
+        """Admit a booking or raise BookingRejectedException right away."""
+        limit = (
+            self.target_concurrency
+            if priority == BookingPriority.REBOOKING
+            else self.standard_concurrency
+        )
+
+        with self._lock:
+            for target in targets:
+                if self._in_flight[target] >= limit:
+                    self._shed(airline_code, f"{target} busy")
+                    raise BookingRejectedException(
+                        airline_code, f"{target} busy", self.busy_retry_after
+                    )
+
+            if priority != BookingPriority.REBOOKING:
+                bucket = self._bucket_for(airline_code)
+                if bucket.rate == 0:
+                    self._shed(airline_code, "suspended")
+                    raise BookingRejectedException(
+                        airline_code, "suspended", self.suspended_retry_after
+                    )
+                retry_after = bucket.try_take()
+                if retry_after > 0:
+                    self._shed(airline_code, "rate limited")
+                    raise BookingRejectedException(airline_code, "rate limited", retry_after)
+
+            for target in targets:
+                self._in_flight[target] += 1
+                if self._in_flight[target] > self.metrics.peak_in_flight[target]:
+                    self.metrics.peak_in_flight[target] = self._in_flight[target]
+            self.metrics.admitted += 1
+
+        return AdmissionTicket(self, targets)
+
+    def in_flight(self, target: str) -> int:
+        """Return how many admitted bookings are currently using a target."""
+        with self._lock:
+            return self._in_flight[target]
+
+    def _bucket_for(self, airline_code: str) -> TokenBucket:
+        bucket = self._buckets.get(airline_code)
+        if bucket is None:
+            rate = self.airline_rates.get(airline_code, self.airline_rate)
+            bucket = TokenBucket(rate, self.airline_burst, self._clock)
+            self._buckets[airline_code] = bucket
+        return bucket
+
+    def _shed(self, airline_code: str, reason: str) -> None:
+        self.metrics.shed += 1
+        self.metrics.shed_by_airline[airline_code] += 1
+        self.metrics.shed_by_reason[reason] += 1
+
+    def _release(self, targets: Sequence[str]) -> None:
+        with self._lock:
+            for target in targets:
+                self._in_flight[target] -= 1
+
+
+class AdmissionControlledCoordinator:
+    """Runs bookings through an AdmissionController before the coordinator.
+
+    Every worker wraps its own coordinator; the controller is shared.
+    """
+
+    def __init__(self, coordinator: BookingCoordinatorImpl, controller: AdmissionController) -> None:
+        self.coordinator = coordinator
+        self.controller = controller
+
+    def book_flight(
+        self,
+        passenger_name: str,
+        flight_number: str,
+        departure_date: datetime,
+        passenger_count: int,
+        airline_code: str,
+        special_requests: str = "",
+        priority: BookingPriority = BookingPriority.STANDARD,
+    ) -> Booking:
+        """Book a flight if capacity allows, else raise BookingRejectedException."""
+        targets = self.coordinator.downstream_targets(flight_number, airline_code)
+        with self.controller.admit(airline_code, targets, priority):
+            return self.coordinator.book_flight(
+                passenger_name,
+                flight_number,
+                departure_date,
+                passenger_count,
+                airline_code,
+                special_requests,
+            )
+
+    def rebook(self, booking_reference: str, changes: BookingChanges) -> Booking:
+        """Rebook with rebooking priority, else raise BookingRejectedException."""
+        original = self.coordinator.find_booking(booking_reference)
+        if original is None:
+            raise ValueError(f"Unknown booking reference: {booking_reference}")
+
+        targets = self.coordinator.downstream_targets(original.flight_number, original.airline_code)
+        with self.controller.admit(original.airline_code, targets, BookingPriority.REBOOKING):
+            return self.coordinator.rebook_booking(original, changes)
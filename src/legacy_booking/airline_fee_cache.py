@@ -0,0 +1,159 @@
+"""Process-wide airline fee and tax table shared by all PricingEngine instances.
+
+Writers publish a complete new snapshot under a lock (copy-on-write);
+readers just take the current snapshot reference and never lock. A reader
+therefore always sees one consistent version of the table, even while
+partners publish new fees.
+"""
+
+import threading
+from dataclasses import dataclass
+from decimal import Decimal
+from types import MappingProxyType
+from typing import Callable, Dict, Mapping, Optional
+
+
+@dataclass(frozen=True)
+class FeeTableSnapshot:
+    """Immutable version of the fee and tax tables.
+
+    fees are published by partners and charged on every booking;
+    computed_fees are legacy defaults worked out on a cache miss and only
+    returned by lookups.
+    """
+
+    version: int
+    fees: Mapping[str, Decimal]
+    tax_rates: Mapping[str, Decimal]
+    computed_fees: Mapping[str, Decimal]
+
+
+class AirlineFeeCache:
+    """Bounded, versioned airline fee and tax table.
+
+    Holds at most max_airlines airlines; the least recently written one is
+    evicted first.
+    """
+
+    def __init__(self, max_airlines: int = 256) -> None:
+        self.max_airlines = max_airlines
+        self._lock = threading.Lock()
+        self._snapshot = FeeTableSnapshot(
+            0, MappingProxyType({}), MappingProxyType({}), MappingProxyType({})
+        )
+
+    def snapshot(self) -> FeeTableSnapshot:
+        """Return the current table version (lock-free)."""
+        return self._snapshot
+
+    def get_fee(self, airline_code: str) -> Optional[Decimal]:
+        """Return the published fee for an airline, if any (lock-free)."""
+        return self._snapshot.fees.get(airline_code)
+
+    def get_or_compute_fee(self, airline_code: str, compute: Callable[[], Decimal]) -> Decimal:
+        """Return the published fee, else the computed one, computing it on a miss.
+
+        Computed fees are kept apart from published ones, so a lookup never
+        changes what later bookings are charged.
+        """
+        fee = self._lookup_fee(self._snapshot, airline_code)
+        if fee is not None:
+            return fee
+
+        with self._lock:
+            fee = self._lookup_fee(self._snapshot, airline_code)  # Another writer may have won
+            if fee is None:
+                fee = compute()
+                self._publish_locked({}, {}, {airline_code: fee})
+            return fee
+
+    def publish(
+        self,
+        fees: Optional[Mapping[str, Decimal]] = None,
+        tax_rates: Optional[Mapping[str, Decimal]] = None,
+    ) -> int:
+        """Atomically apply partner fee and tax changes; return the new version."""
+        with self._lock:
+            return self._publish_locked(fees or {}, tax_rates or {})
+
+    def invalidate(self, airline_code: Optional[str] = None) -> int:
+        """Drop one airline, or everything; return the new version."""
+        with self._lock:
+            current = self._snapshot
+            if airline_code is None:
+                fees: Dict[str, Decimal] = {}
+                tax_rates: Dict[str, Decimal] = {}
+                computed_fees: Dict[str, Decimal] = {}
+            else:
+                fees = {code: fee for code, fee in current.fees.items() if code != airline_code}
+                tax_rates = {
+                    code: rate for code, rate in current.tax_rates.items() if code != airline_code
+                }
+                computed_fees = {
+                    code: fee for code, fee in current.computed_fees.items() if code != airline_code
+                }
+            self._snapshot = FeeTableSnapshot(
+                current.version + 1,
+                MappingProxyType(fees),
+                MappingProxyType(tax_rates),
+                MappingProxyType(computed_fees),
+            )
+            return self._snapshot.version
+
+    def __len__(self) -> int:
+        snapshot = self._snapshot
+        return len(snapshot.fees.keys() | snapshot.tax_rates.keys() | snapshot.computed_fees.keys())
+
+    @staticmethod
+    def _lookup_fee(snapshot: FeeTableSnapshot, airline_code: str) -> Optional[Decimal]:
+        fee = snapshot.fees.get(airline_code)
+        return fee if fee is not None else snapshot.computed_fees.get(airline_code)
+
+    def _publish_locked(
+        self,
+        fee_changes: Mapping[str, Decimal],
+        tax_changes: Mapping[str, Decimal],
+        computed_changes: Mapping[str, Decimal] = MappingProxyType({}),
+    ) -> int:
+        current = self._snapshot
+        fees = dict(current.fees)
+        tax_rates = dict(current.tax_rates)
+        computed_fees = dict(current.computed_fees)
+        for table, changes in (
+            (fees, fee_changes),
+            (tax_rates, tax_changes),
+            (computed_fees, computed_changes),
+        ):
+            for airline_code, value in changes.items():
+                table.pop(airline_code, None)  # Re-insert so it counts as most recent
+                table[airline_code] = value
+
+        # Evict the least recently written airlines beyond the bound
+        airlines = list(dict.fromkeys([*fees, *tax_rates, *computed_fees]))
+        changed = set(fee_changes) | set(tax_changes) | set(computed_changes)
+        excess = len(airlines) - self.max_airlines
+        for airline_code in airlines:
+            if excess <= 0:
+                break
+            if airline_code in changed:
+                continue
+            fees.pop(airline_code, None)
+            tax_rates.pop(airline_code, None)
+            computed_fees.pop(airline_code, None)
+            excess -= 1
+
+        self._snapshot = FeeTableSnapshot(
+            current.version + 1,
+            MappingProxyType(fees),
+            MappingProxyType(tax_rates),
+            MappingProxyType(computed_fees),
+        )
+        return self._snapshot.version
+
+
+_shared_cache = AirlineFeeCache()
+
+
+def get_shared_fee_cache() -> AirlineFeeCache:
+    """Return the fee cache shared by every PricingEngine in this process."""
+    return _shared_cache
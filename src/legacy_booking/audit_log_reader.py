@@ -0,0 +1,261 @@
+"""Memory-mapped readers for binary audit log segments."""
+
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from .audit_record import (
+    BOOKING_TIME_OFFSET,
+    FLIGHT_ID_OFFSET,
+    HEADER_FORMAT,
+    HEADER_SIZE,
+    RECORD_FORMAT,
+    RECORD_SIZE,
+    REFERENCE_ID_OFFSET,
+    SEGMENT_MAGIC,
+    AuditEventType,
+    PricingAuditRecord,
+    from_epoch_seconds,
+    to_epoch_seconds,
+)
+
+_UINT = struct.Struct("<I")
+_USHORT = struct.Struct("<H")
+_INT64 = struct.Struct("<q")
+
+SEGMENT_SUFFIX = ".seg"
+
+
+class AuditLogReader:
+    """Reads one audit segment without loading its records into memory.
+
+    Filters compare the fixed-width fields in place; only matching records
+    are decoded and only rendered when the caller asks for text.
+    """
+
+    def __init__(self, segment_path: str) -> None:
+        self._file = open(segment_path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file cannot be mapped
+            self._file.close()
+            raise ValueError(f"Not an audit segment: {segment_path}")
+
+        if len(self._map) < HEADER_SIZE or self._map[:len(SEGMENT_MAGIC)] != SEGMENT_MAGIC:
+            self.close()
+            raise ValueError(f"Not an audit segment: {segment_path}")
+
+        try:
+            self._read_header()
+        except (ValueError, OverflowError, struct.error):
+            self.close()
+            raise ValueError(f"Corrupt or truncated audit segment: {segment_path}")
+
+    def _read_header(self) -> None:
+        _, self.record_count, self._string_count, first, last = struct.unpack_from(
+            HEADER_FORMAT, self._map, 0
+        )
+        self._string_table_offset = HEADER_SIZE + self.record_count * RECORD_SIZE
+        # Every string needs at least its length prefix
+        if self._string_table_offset + self._string_count * _USHORT.size > len(self._map):
+            raise ValueError("counts exceed file size")
+
+        self.first_booking_date = from_epoch_seconds(first)
+        self.last_booking_date = from_epoch_seconds(last)
+        # The string table is only walked when a query needs it
+        self._string_offsets: Optional[List[int]] = None
+        self._strings: Dict[int, str] = {}
+
+    def _offsets(self) -> List[int]:
+        """Return the offset of every string's length prefix, walking the table once."""
+        if self._string_offsets is None:
+            data = self._map
+            offsets = []
+            offset = self._string_table_offset
+            for _ in range(self._string_count):
+                if offset + _USHORT.size > len(data):
+                    raise ValueError(f"Truncated audit segment string table at {offset}")
+                offsets.append(offset)
+                offset += _USHORT.size + _USHORT.unpack_from(data, offset)[0]
+            if offset > len(data):
+                raise ValueError(f"Truncated audit segment string table at {offset}")
+            self._string_offsets = offsets
+        return self._string_offsets
+
+    def _string(self, string_id: int) -> str:
+        value = self._strings.get(string_id)
+        if value is None:
+            offset = self._offsets()[string_id]
+            length = _USHORT.unpack_from(self._map, offset)[0]
+            start = offset + _USHORT.size
+            value = self._map[start:start + length].decode("utf-8")
+            self._strings[string_id] = value
+        return value
+
+    def close(self) -> None:
+        """Release the mapping and the underlying file."""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "AuditLogReader":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.record_count
+
+    def overlaps(self, start: Optional[datetime], end: Optional[datetime]) -> bool:
+        """Return whether any record could fall in [start, end), judging by the header."""
+        if self.record_count == 0:
+            return False
+        if start is not None and self.last_booking_date < start:
+            return False
+        if end is not None and self.first_booking_date >= end:
+            return False
+        return True
+
+    def records(
+        self,
+        booking_reference: Optional[str] = None,
+        flight_number: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Iterator[PricingAuditRecord]:
+        """Yield records matching all given filters.
+
+        The time range applies to the booking time and is inclusive of start,
+        exclusive of end. Raises ValueError if the string table turns out to
+        be truncated.
+        """
+        if not self.overlaps(start, end):
+            return  # Decided from the header alone
+
+        reference_id = self._lookup_id(booking_reference)
+        flight_id = self._lookup_id(flight_number)
+        if reference_id == -1 or flight_id == -1:
+            return  # Unknown string cannot match any record
+
+        start_seconds = to_epoch_seconds(start) if start is not None else None
+        end_seconds = to_epoch_seconds(end) if end is not None else None
+
+        data = self._map
+        records_end = HEADER_SIZE + self.record_count * RECORD_SIZE
+        for offset in range(HEADER_SIZE, records_end, RECORD_SIZE):
+            if reference_id is not None:
+                if _UINT.unpack_from(data, offset + REFERENCE_ID_OFFSET)[0] != reference_id:
+                    continue
+            if flight_id is not None:
+                if _UINT.unpack_from(data, offset + FLIGHT_ID_OFFSET)[0] != flight_id:
+                    continue
+            if start_seconds is not None or end_seconds is not None:
+                booked_at = _INT64.unpack_from(data, offset + BOOKING_TIME_OFFSET)[0]
+                if start_seconds is not None and booked_at < start_seconds:
+                    continue
+                if end_seconds is not None and booked_at >= end_seconds:
+                    continue
+            yield self._decode(offset)
+
+    def render(
+        self,
+        booking_reference: Optional[str] = None,
+        flight_number: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Iterator[str]:
+        """Yield text lines for the records matching the given filters."""
+        for record in self.records(booking_reference, flight_number, start, end):
+            yield record.render()
+
+    def _lookup_id(self, value: Optional[str]) -> Optional[int]:
+        if value is None:
+            return None
+        encoded = value.encode("utf-8")
+        needle = _USHORT.pack(len(encoded)) + encoded
+        data = self._map
+        position = data.find(needle, self._string_table_offset)
+        if position == -1:
+            return -1  # Common case in an archive: no need to walk the table
+        offsets = self._offsets()
+        while position != -1:
+            # A match may straddle two entries; only accept one at an entry start
+            index = bisect_left(offsets, position)
+            if index < len(offsets) and offsets[index] == position:
+                return index
+            position = data.find(needle, position + 1)
+        return -1
+
+    def _decode(self, offset: int) -> PricingAuditRecord:
+        (
+            event_type,
+            reference_id,
+            flight_id,
+            booked_at,
+            departure,
+            base,
+            weekday,
+            seasonal,
+            special,
+            discount,
+            final,
+        ) = struct.unpack_from(RECORD_FORMAT, self._map, offset)
+        return PricingAuditRecord(
+            booking_reference=self._string(reference_id),
+            flight_number=self._string(flight_id),
+            booking_date=from_epoch_seconds(booked_at),
+            departure_date=from_epoch_seconds(departure),
+            base_price=Decimal(base).scaleb(-2),
+            weekday_multiplier=Decimal(weekday).scaleb(-4),
+            seasonal_bonus=Decimal(seasonal).scaleb(-2),
+            special_request_surcharge=Decimal(special).scaleb(-2),
+            discount_amount=Decimal(discount).scaleb(-2),
+            final_price=Decimal(final).scaleb(-2),
+            event_type=AuditEventType(event_type),
+        )
+
+
+class AuditArchiveReader:
+    """Filters records across many segments, oldest segment first.
+
+    Segments are opened one at a time. A segment is skipped from its header
+    alone when its time range misses the filter, and without scanning its
+    records when the reference or flight does not occur in its string table.
+    """
+
+    def __init__(self, segment_paths: Sequence[str]) -> None:
+        self.segment_paths = list(segment_paths)
+
+    @classmethod
+    def from_directory(cls, directory: str) -> "AuditArchiveReader":
+        """Read every segment in a directory, in file name order."""
+        names = sorted(name for name in os.listdir(directory) if name.endswith(SEGMENT_SUFFIX))
+        return cls([os.path.join(directory, name) for name in names])
+
+    def records(
+        self,
+        booking_reference: Optional[str] = None,
+        flight_number: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Iterator[PricingAuditRecord]:
+        """Yield records matching all given filters from every segment."""
+        for path in self.segment_paths:
+            with AuditLogReader(path) as reader:
+                if reader.overlaps(start, end):
+                    yield from reader.records(booking_reference, flight_number, start, end)
+
+    def render(
+        self,
+        booking_reference: Optional[str] = None,
+        flight_number: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Iterator[str]:
+        """Yield text lines for the records matching the given filters."""
+        for record in self.records(booking_reference, flight_number, start, end):
+            yield record.render()
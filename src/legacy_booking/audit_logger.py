@@ -3,6 +3,8 @@
 from abc import ABC, abstractmethod
 from decimal import Decimal
 
+from .audit_record import PricingAuditRecord
+
 
 class AuditLogger(ABC):
     """Abstract interface for audit logging operations."""
@@ -21,6 +23,16 @@ class AuditLogger(ABC):
         """Record details of pricing calculations."""
         pass
 
+    def record_pricing_breakdown(self, record: PricingAuditRecord) -> None:
+        """Record a structured pricing calculation.
+
+        Loggers that store binary records override this; the default renders
+        the text form and hands it to record_pricing_calculation.
+        """
+        self.record_pricing_calculation(
+            record.calculation_details(), record.final_price, record.flight_info()
+        )
+
     @abstractmethod
     def log_error_with_alert(
         self, ex: Exception, context: str, booking_ref: str
@@ -3,6 +3,7 @@
 from decimal import Decimal
 
 from .audit_logger import AuditLogger
+from .audit_record import PricingAuditRecord
 from .can_not_use_in_tests_exception import CanNotUseInTestsException
 
 
@@ -22,6 +23,9 @@ class AuditLoggerImpl(AuditLogger):
     ) -> None:
         raise CanNotUseInTestsException("AuditLoggerImpl")
 
+    def record_pricing_breakdown(self, record: PricingAuditRecord) -> None:
+        raise CanNotUseInTestsException("AuditLoggerImpl")
+
     def log_error_with_alert(
         self, ex: Exception, context: str, booking_ref: str
     ) -> None:
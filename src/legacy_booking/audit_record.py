@@ -0,0 +1,172 @@
+"""Structured audit records and the binary segment format they are stored in.
+
+Pricing records keep the raw values of a calculation. Text is only rendered
+when somebody reads the log, never on the booking path.
+
+Segment layout (little-endian):
+    header   magic, record count, string count, first and last booking time
+    records  fixed-width RECORD_FORMAT entries
+    strings  length-prefixed UTF-8, indexed by the record string ids
+"""
+
+import struct
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from enum import IntEnum
+from typing import BinaryIO, Dict, List
+
+SEGMENT_MAGIC = b"LBAUDIT1"
+HEADER_FORMAT = "<8sIIqq"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+# event type, reference id, flight id, booking time, departure time,
+# base, weekday (basis points), seasonal, special, discount, final
+RECORD_FORMAT = "<B3xIIqqqqqqqq"
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+REFERENCE_ID_OFFSET = 4
+FLIGHT_ID_OFFSET = 8
+BOOKING_TIME_OFFSET = 12
+
+_EPOCH = datetime(1970, 1, 1)
+_CENT = Decimal("0.01")
+_BASIS_POINT = Decimal("0.0001")
+
+
+class AuditEventType(IntEnum):
+    """Event types stored in the first byte of every record."""
+
+    FLIGHT_BOOKED = 1
+    PRICING_CALCULATED = 2
+
+
+def to_epoch_seconds(value: datetime) -> int:
+    """Convert a naive datetime to whole seconds since the epoch."""
+    delta = value - _EPOCH
+    return delta.days * 86400 + delta.seconds
+
+
+def from_epoch_seconds(value: int) -> datetime:
+    """Inverse of to_epoch_seconds."""
+    return _EPOCH + timedelta(seconds=value)
+
+
+def to_cents(amount: Decimal) -> int:
+    """Round a monetary amount to whole cents."""
+    return int(amount.quantize(_CENT, rounding=ROUND_HALF_UP).scaleb(2))
+
+
+@dataclass(frozen=True)
+class PricingAuditRecord:
+    """Raw inputs of one pricing calculation.
+
+    Amounts are kept as given; conversion to cents happens when the record
+    is written to a segment.
+    """
+
+    booking_reference: str
+    flight_number: str
+    booking_date: datetime
+    departure_date: datetime
+    base_price: Decimal
+    weekday_multiplier: Decimal
+    seasonal_bonus: Decimal
+    special_request_surcharge: Decimal
+    discount_amount: Decimal
+    final_price: Decimal
+    event_type: AuditEventType = AuditEventType.PRICING_CALCULATED
+
+    def calculation_details(self) -> str:
+        """Render the calculation the way the text audit log always has."""
+        return (
+            f"Base: {self.base_price}, Weekday: {self.weekday_multiplier}, "
+            f"Seasonal: {self.seasonal_bonus}, Special: {self.special_request_surcharge}, "
+            f"Discount: {self.discount_amount}"
+        )
+
+    def flight_info(self) -> str:
+        """Render the flight description used in the text audit log."""
+        return f"{self.flight_number} on {self.departure_date.strftime('%Y-%m-%d')}"
+
+    def render(self) -> str:
+        """Render a single human readable log line."""
+        return (
+            f"[{self.booking_date.isoformat()}] {self.event_type.name} {self.booking_reference} "
+            f"{self.flight_info()}: {self.calculation_details()} => {self.final_price}"
+        )
+
+
+class StringTable:
+    """Interns strings so records can refer to them by a fixed-width id."""
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def intern(self, value: str) -> int:
+        """Return the id of value, adding it on first use."""
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            self._ids[value] = string_id
+            self.strings.append(value)
+        return string_id
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+
+class AuditSegmentWriter:
+    """Collects pricing records and writes them out as a binary segment."""
+
+    def __init__(self) -> None:
+        self._strings = StringTable()
+        self._records = bytearray()
+        self._count = 0
+        self._first_booked_at = 0
+        self._last_booked_at = 0
+
+    def append(self, record: PricingAuditRecord) -> None:
+        """Encode one record into the pending segment."""
+        booked_at = to_epoch_seconds(record.booking_date)
+        if self._count == 0 or booked_at < self._first_booked_at:
+            self._first_booked_at = booked_at
+        if self._count == 0 or booked_at > self._last_booked_at:
+            self._last_booked_at = booked_at
+
+        self._records += struct.pack(
+            RECORD_FORMAT,
+            record.event_type,
+            self._strings.intern(record.booking_reference),
+            self._strings.intern(record.flight_number),
+            booked_at,
+            to_epoch_seconds(record.departure_date),
+            to_cents(record.base_price),
+            int(record.weekday_multiplier.quantize(_BASIS_POINT).scaleb(4)),
+            to_cents(record.seasonal_bonus),
+            to_cents(record.special_request_surcharge),
+            to_cents(record.discount_amount),
+            to_cents(record.final_price),
+        )
+        self._count += 1
+
+    def write_to(self, stream: BinaryIO) -> None:
+        """Write the complete segment, header first."""
+        stream.write(
+            struct.pack(
+                HEADER_FORMAT,
+                SEGMENT_MAGIC,
+                self._count,
+                len(self._strings),
+                self._first_booked_at,
+                self._last_booked_at,
+            )
+        )
+        stream.write(self._records)
+        for value in self._strings.strings:
+            encoded = value.encode("utf-8")
+            stream.write(struct.pack("<H", len(encoded)))
+            stream.write(encoded)
+
+    def __len__(self) -> int:
+        return self._count
@@ -1,8 +1,40 @@
 """Booking data class."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
+from typing import List, Optional
+
+
+@dataclass(frozen=True)
+class PricingBreakdown:
+    """Components that make up a booking's final price."""
+
+    base_price: Decimal
+    weekday_multiplier: Decimal
+    seasonal_bonus: Decimal
+    special_request_surcharge: Decimal
+    discount_amount: Decimal  # Zero when no promotion applied
+
+    @property
+    def final_price(self) -> Decimal:
+        """Combine the components the same way book_flight does."""
+        return (
+            (self.base_price * self.weekday_multiplier)
+            + self.seasonal_bonus
+            + self.special_request_surcharge
+            - self.discount_amount
+        )
+
+
+@dataclass(frozen=True)
+class BookingChanges:
+    """Fields a rebooking may change; None leaves a field as it was."""
+
+    departure_date: Optional[datetime] = None
+    passenger_count: Optional[int] = None
+    special_requests: Optional[str] = None
+    passenger_name: Optional[str] = None
 
 
 @dataclass
@@ -19,6 +51,8 @@ class Booking:
     special_requests: str
     booking_date: datetime
     status: str
+    seat_assignments: List[str] = field(default_factory=list)
+    pricing: Optional[PricingBreakdown] = None
 
     def __str__(self) -> str:
         """Return formatted booking details."""
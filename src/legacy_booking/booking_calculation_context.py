@@ -0,0 +1,105 @@
+"""Per-booking calculation context and long-lived coordinator state.
+
+Replaces the old ``temporary_data`` dictionary, which kept references to
+every intermediate value the coordinator ever produced.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+
+
+class BookingCalculationContext:
+    """Fixed-layout holder for the intermediates of a single booking.
+
+    Instances are handed out by BookingCalculationContextPool and reset
+    before they are reused, so nothing outlives the booking it belongs to.
+    """
+
+    __slots__ = (
+        "processed_airline",
+        "flight_number",
+        "availability_connection_string",
+        "departure_date",
+        "is_peak_day",
+        "current_season",
+        "lucky_booking",
+        "has_special_requests",
+        "special_requests_count",
+        "smtp_lookup_time",
+        "log_directory",
+        "generated_reference",
+        "booking_status",
+    )
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all references held from the previous booking."""
+        self.processed_airline: str = ""
+        self.flight_number: str = ""
+        self.availability_connection_string: str = ""
+        self.departure_date: Optional[datetime] = None
+        self.is_peak_day: bool = False
+        self.current_season: str = ""
+        self.lucky_booking: bool = False
+        self.has_special_requests: bool = False
+        self.special_requests_count: int = 0
+        self.smtp_lookup_time: Optional[datetime] = None
+        self.log_directory: str = ""
+        self.generated_reference: str = ""
+        self.booking_status: str = ""
+
+
+class BookingCalculationContextPool:
+    """Free list of calculation contexts reused across bookings.
+
+    NOTE: Not thread-safe, just like the coordinator that owns it.
+    """
+
+    def __init__(self, max_size: int = 4) -> None:
+        self.max_size = max_size
+        self._free: List[BookingCalculationContext] = []
+
+    def acquire(self) -> BookingCalculationContext:
+        """Return a clean context, reusing a released one when available."""
+        if self._free:
+            return self._free.pop()
+        return BookingCalculationContext()
+
+    def release(self, context: BookingCalculationContext) -> None:
+        """Reset the context and keep it for the next booking."""
+        context.reset()
+        if len(self._free) < self.max_size:
+            self._free.append(context)
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+
+class CoordinatorState:
+    """State that intentionally survives from one booking to the next.
+
+    Every field here influences later bookings (pricing, notifications,
+    logging), which is why it cannot live in the per-booking context.
+    """
+
+    __slots__ = (
+        "last_booking_price",
+        "last_booking_date",
+        "last_failure_reason",
+        "debug_mode",
+        "calculation_count",
+        "historical_lookup_count",
+        "reference_generation_count",
+    )
+
+    def __init__(self) -> None:
+        self.last_booking_price: Optional[Decimal] = None
+        self.last_booking_date: Optional[datetime] = None
+        self.last_failure_reason: Optional[str] = None
+        self.debug_mode: bool = False  # Enables verbose audit logging
+        self.calculation_count: int = 0
+        self.historical_lookup_count: int = 0
+        self.reference_generation_count: int = 0
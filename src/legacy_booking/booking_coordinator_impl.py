@@ -29,18 +29,61 @@ The knights who gave their best before you:
 """
 
 import math
+from dataclasses import replace
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, Any, Optional
+from typing import Dict, List, Optional, Sequence, Tuple, Type, TypeVar
 
 from global_object_factory import create
 
+from .airline_fee_cache import AirlineFeeCache
+from .audit_logger import AuditLogger
 from .audit_logger_impl import AuditLoggerImpl
-from .booking import Booking
+from .audit_record import PricingAuditRecord
+from .booking import Booking, BookingChanges, PricingBreakdown
+from .booking_calculation_context import (
+    BookingCalculationContext,
+    BookingCalculationContextPool,
+    CoordinatorState,
+)
+from .booking_repository import BookingRepository
 from .booking_repository_impl import BookingRepositoryImpl
+from .coordinator_checkpoint import CoordinatorCheckpoint
+from .flight_availability_service import FlightAvailabilityService
 from .flight_availability_service_impl import FlightAvailabilityServiceImpl
 from .partner_notifier_impl import PartnerNotifierImpl
 from .pricing_engine import PricingEngine
+from .retry_policy import (
+    BookingCountRetryPolicy,
+    ExponentialBackoffRetryPolicy,
+    Retrier,
+    RetryBudget,
+    RetryMetrics,
+    RetryPolicy,
+    get_shared_retry_budget,
+    get_shared_retry_metrics,
+)
+
+# Database connection (TODO: move to configuration file)
+BOOKING_DATABASE_CONNECTION_STRING = (
+    "Server=production-db;Database=FlightBookings;Trusted_Connection=true;"
+)
+
+# Partner SMTP hosts (TODO: move to configuration file)
+SMTP_SERVERS = {
+    "AA": "smtp.american.com",
+    "UA": "smtp.united.com",
+    "BA": "smtp.britishairways.com",
+}
+DEFAULT_SMTP_SERVER = "smtp.generic-airline.com"
+
+SEAT_RESERVATION_ATTEMPTS = 3  # Seat picks lost to concurrent bookings before giving up
+
+T = TypeVar("T")
+
+
+def _changed(new_value: Optional[T], old_value: T) -> T:
+    return old_value if new_value is None else new_value
 
 
 class BookingCoordinatorImpl:
@@ -50,12 +93,36 @@ class BookingCoordinatorImpl:
     Last updated: 2018 (needs refactoring for new airline partnerships)
     """
 
-    def __init__(self, booking_date: Optional[datetime] = None) -> None:
+    def __init__(
+        self,
+        booking_date: Optional[datetime] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        checkpoint: Optional[CoordinatorCheckpoint] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        retry_metrics: Optional[RetryMetrics] = None,
+        fee_cache: Optional[AirlineFeeCache] = None,
+        audit_logger_type: Type[AuditLogger] = AuditLoggerImpl,
+    ) -> None:
         self._booking_date = booking_date or datetime.now()
         self.last_booking_ref: str = ""  # Stores reference for debugging purposes
         self.booking_counter: int = 1  # Global counter for booking sequence
         self.is_processing_booking: bool = False  # Thread safety flag (NOTE: not actually thread-safe)
-        self.temporary_data: Dict[str, Any] = {}  # Temporary storage for calculation intermediates
+        self.state = CoordinatorState()  # State carried over between bookings
+        self._context_pool = BookingCalculationContextPool()  # Reused per-booking intermediates
+        self.retry_policy = retry_policy or ExponentialBackoffRetryPolicy()  # Calls wrapped by the retrier
+        self.repository_retry_policy = BookingCountRetryPolicy()  # Repository retries internally
+        # Shared by default: the budget has to see all traffic to cap retries
+        self.retry_metrics = retry_metrics or get_shared_retry_metrics()
+        self._retrier = Retrier(
+            self.retry_policy, retry_budget or get_shared_retry_budget(), self.retry_metrics
+        )
+        self._audit_logger_type = audit_logger_type  # e.g. SegmentAuditLogger
+        self._fee_cache = fee_cache  # None means the process-wide cache
+
+        # Warm restart: pick up counter and state where the last process left off
+        self._checkpoint = checkpoint
+        if checkpoint is not None:
+            checkpoint.restore(self)
 
     def book_flight(
         self,
@@ -71,101 +138,170 @@ class BookingCoordinatorImpl:
         Coordinates all services and returns booking object.
         WARNING: This method is not thread-safe due to shared state.
         """
+        context = self._context_pool.acquire()
+        try:
+            return self._book_flight_with_context(
+                context,
+                passenger_name,
+                flight_number,
+                departure_date,
+                passenger_count,
+                airline_code,
+                special_requests,
+            )
+        finally:
+            self._context_pool.release(context)
+
+    def _book_flight_with_context(
+        self,
+        context: BookingCalculationContext,
+        passenger_name: str,
+        flight_number: str,
+        departure_date: datetime,
+        passenger_count: int,
+        airline_code: str,
+        special_requests: str,
+    ) -> Booking:
         # Set processing flag to prevent concurrent access
         self.is_processing_booking = True
         self.booking_counter += 1  # Increment global booking counter
+        if self._checkpoint is not None:
+            self._checkpoint.reserve(self)  # Lease the number before anything uses it
 
-        # Initialize database connection (TODO: move to configuration file)
-        connection_string = "Server=production-db;Database=FlightBookings;Trusted_Connection=true;"
-        max_retries = self._calculate_retries_based_on_booking_count()  # Dynamic retry calculation
+        connection_string = BOOKING_DATABASE_CONNECTION_STRING
+        repository_retries = self._calculate_retries_based_on_booking_count()  # Dynamic retry calculation
+        max_retries = self.retry_policy.max_retries(self.booking_counter)
 
-        # Create repository with calculated parameters
-        repository = create(BookingRepositoryImpl)(connection_string, max_retries)
+        # Create repository with calculated parameters (it retries internally, outside the budget)
+        repository = create(BookingRepositoryImpl)(connection_string, repository_retries)
 
-        # Calculate pricing engine parameters based on current state
-        tax_rate = self._calculate_tax_rate_based_on_global_state(airline_code)
-        airline_fees = self._build_airline_fees_from_temporary_data(airline_code)
-        enable_random_surcharges = self.booking_counter % 3 == 0  # Enable surcharges every 3rd booking
-        region_code = self._determine_region_from_flight_number(flight_number)
-        historical_average = self._get_historical_average_from_repository(repository, flight_number)
-
-        pricing_engine = PricingEngine(
-            tax_rate, airline_fees, enable_random_surcharges, region_code, historical_average, self._booking_date
-        )
+        pricing_engine = self._create_pricing_engine(context, repository, flight_number, airline_code)
 
         availability_connection_string = self._modify_connection_string_for_availability(
-            connection_string, flight_number
+            context, connection_string, flight_number
         )
         availability_service = create(FlightAvailabilityServiceImpl)(availability_connection_string)
 
-        available_seats = availability_service.check_and_get_available_seats_for_booking(
-            flight_number, departure_date, passenger_count
+        available_seats = self._retrier.call(
+            "availability",
+            max_retries,
+            availability_service.check_and_get_available_seats_for_booking,
+            flight_number,
+            departure_date,
+            passenger_count,
+        )
+        assigned_seats = self._reserve_seats(
+            availability_service, available_seats, flight_number, departure_date, passenger_count
         )
-        if len(available_seats) < passenger_count:
-            self.temporary_data["last_failure_reason"] = "Not enough seats"
+        if len(assigned_seats) < passenger_count:
+            self.state.last_failure_reason = "Not enough seats"
             self.is_processing_booking = False
             raise ValueError("Not enough seats available")
 
-        base_price = pricing_engine.calculate_base_price_with_taxes(
-            flight_number, departure_date, passenger_count, airline_code
-        )
+        # Until the booking is stored nothing refers to the seats, so give them back on failure
+        try:
+            base_price = pricing_engine.calculate_base_price_with_taxes(
+                flight_number, departure_date, passenger_count, airline_code
+            )
 
-        # Apply additional pricing adjustments not handled by PricingEngine
-        weekday_multiplier = self._get_weekday_multiplier_and_update_global_state(departure_date)
-        seasonal_bonus = self._calculate_seasonal_bonus_with_side_effects(departure_date, flight_number)
-        special_request_surcharge = self._process_special_requests_and_calculate_surcharge(
-            special_requests, airline_code
-        )
+            # Apply additional pricing adjustments not handled by PricingEngine
+            weekday_multiplier = self._get_weekday_multiplier_and_update_global_state(
+                context, departure_date
+            )
+            seasonal_bonus = self._calculate_seasonal_bonus_with_side_effects(
+                context, departure_date, flight_number
+            )
+            special_request_surcharge = self._process_special_requests_and_calculate_surcharge(
+                context, special_requests, airline_code
+            )
 
-        # Calculate final price with all adjustments
-        final_price = (base_price * weekday_multiplier) + seasonal_bonus + special_request_surcharge
+            # Calculate final price with all adjustments
+            final_price = (base_price * weekday_multiplier) + seasonal_bonus + special_request_surcharge
 
-        # Apply any promotional discounts
-        is_valid, discount_amount = pricing_engine.validate_pricing_parameters_and_calculate_discount(
-            flight_number
-        )
-        if is_valid:
-            final_price -= discount_amount
-
-        # Configure partner notification settings
-        smtp_server = self._determine_smtp_server_from_airline_code(airline_code)
-        use_encryption = self.booking_counter % 2 == 0  # Alternate encryption for load balancing
-        partner_notifier = create(PartnerNotifierImpl)(smtp_server, use_encryption)
-
-        # Setup audit logging with dynamic configuration
-        log_directory = self._calculate_log_directory_from_booking_count()
-        verbose_mode = "debug_mode" in self.temporary_data  # Enable verbose mode if debug flag set
-        audit_logger = create(AuditLoggerImpl)(log_directory, verbose_mode)
-
-        # Generate unique booking reference
-        booking_reference = self._generate_booking_reference_and_update_counters(
-            passenger_name, flight_number
-        )
-        self.last_booking_ref = booking_reference  # Store for debugging and error tracking
+            # Apply any promotional discounts
+            is_valid, discount_amount = pricing_engine.validate_pricing_parameters_and_calculate_discount(
+                flight_number
+            )
+            if is_valid:
+                final_price -= discount_amount
+
+            # Configure partner notification settings
+            smtp_server = self._determine_smtp_server_from_airline_code(context, airline_code)
+            use_encryption = self.booking_counter % 2 == 0  # Alternate encryption for load balancing
+            partner_notifier = create(PartnerNotifierImpl)(smtp_server, use_encryption)
+
+            # Setup audit logging with dynamic configuration
+            log_directory = self._calculate_log_directory_from_booking_count(context)
+            verbose_mode = self.state.debug_mode  # Enable verbose mode if debug flag set
+            audit_logger = create(self._audit_logger_type)(log_directory, verbose_mode)
+
+            # Generate unique booking reference
+            booking_reference = self._generate_booking_reference_and_update_counters(
+                context, passenger_name, flight_number
+            )
+            self.last_booking_ref = booking_reference  # Store for debugging and error tracking
 
-        # Save booking details
-        actual_booking_ref = repository.save_booking_details(
-            passenger_name,
-            f"{flight_number} on {departure_date.strftime('%Y-%m-%d')} for {passenger_count} passengers",
-            final_price,
-            self._booking_date,
-        )
+            booking_status = self._determine_booking_status_from_global_state(
+                context, final_price, passenger_count
+            )
+
+            # Save booking details; the repository assigns the reference the record is keyed by
+            actual_booking_ref = repository.save_booking_details(
+                passenger_name,
+                f"{flight_number} on {departure_date.strftime('%Y-%m-%d')} for {passenger_count} passengers",
+                final_price,
+                self._booking_date,
+            )
+            booking = Booking(
+                booking_reference=actual_booking_ref,
+                passenger_name=passenger_name,
+                flight_number=flight_number,
+                departure_date=departure_date,
+                passenger_count=passenger_count,
+                airline_code=airline_code,
+                final_price=final_price,
+                special_requests=special_requests,
+                booking_date=self._booking_date,
+                status=booking_status,
+                seat_assignments=assigned_seats,
+                pricing=PricingBreakdown(
+                    base_price, weekday_multiplier, seasonal_bonus, special_request_surcharge, discount_amount
+                ),
+            )
+            # Stored before partners hear of it, so a failed notification leaves a rebookable booking
+            repository.save_booking_record(booking)
+        except Exception:
+            availability_service.release_seats(flight_number, departure_date, assigned_seats)
+            raise
 
         # Log the booking activity
         audit_logger.log_booking_activity(
             "Flight Booked", actual_booking_ref, f"Passenger: {passenger_name}, Flight: {flight_number}"
         )
 
-        audit_logger.record_pricing_calculation(
-            f"Base: {base_price}, Weekday: {weekday_multiplier}, Seasonal: {seasonal_bonus}, "
-            f"Special: {special_request_surcharge}, Discount: {discount_amount}",
-            final_price,
-            f"{flight_number} on {departure_date.strftime('%Y-%m-%d')}",
+        # Text is rendered only when the audit log is read
+        audit_logger.record_pricing_breakdown(
+            PricingAuditRecord(
+                booking_reference=actual_booking_ref,
+                flight_number=flight_number,
+                booking_date=self._booking_date,
+                departure_date=departure_date,
+                base_price=base_price,
+                weekday_multiplier=weekday_multiplier,
+                seasonal_bonus=seasonal_bonus,
+                special_request_surcharge=special_request_surcharge,
+                discount_amount=discount_amount,
+                final_price=final_price,
+            )
         )
 
         # Partner notification
         if self._should_notify_partner_based_on_airline_and_state(airline_code):
-            partner_notifier.notify_partner_about_booking(
+            # Not idempotent: a retry after a timeout could notify the partner twice
+            self._retrier.call(
+                "partner_notifier",
+                0,
+                partner_notifier.notify_partner_about_booking,
                 airline_code,
                 actual_booking_ref,
                 final_price,
@@ -180,44 +316,338 @@ class BookingCoordinatorImpl:
                     airline_code, special_requests, actual_booking_ref
                 )
 
-        booking_status = self._determine_booking_status_from_global_state(final_price, passenger_count)
-        partner_notifier.update_partner_booking_status(airline_code, actual_booking_ref, booking_status)
+        self._retrier.call(
+            "partner_notifier",
+            max_retries,
+            partner_notifier.update_partner_booking_status,
+            airline_code,
+            actual_booking_ref,
+            booking_status,
+        )
+
+        self.state.last_booking_price = final_price
+        self.state.last_booking_date = self._booking_date
+        self.is_processing_booking = False
+        return booking
+
+    def save_checkpoint(self) -> None:
+        """Record the exact coordinator state, e.g. before a deploy."""
+        if self._checkpoint is not None:
+            self._checkpoint.record(self)
+            self._checkpoint.close()
+
+    def find_booking(self, booking_reference: str) -> Optional[Booking]:
+        """Load a booking, with its pricing breakdown, from the repository."""
+        repository = self._create_repository(
+            self.repository_retry_policy.max_retries(self.booking_counter)
+        )
+        return repository.get_booking_record(booking_reference)
+
+    def rebook(self, booking_reference: str, changes: BookingChanges) -> Booking:
+        """Apply changes to an existing booking, repricing only what they affect.
+
+        Availability is queried only when the date or passenger count changes,
+        and the stored booking is updated in place under its reference.
+        """
+        original = self.find_booking(booking_reference)
+        if original is None:
+            raise ValueError(f"Unknown booking reference: {booking_reference}")
+        return self.rebook_booking(original, changes)
+
+    def rebook_booking(self, original: Booking, changes: BookingChanges) -> Booking:
+        """Rebook a booking already loaded with find_booking."""
+        if original.pricing is None:
+            raise ValueError(f"Booking {original.booking_reference} has no pricing breakdown")
+        repository = self._create_repository(self._calculate_retries_based_on_booking_count())
+
+        context = self._context_pool.acquire()
+        try:
+            return self._rebook_with_context(
+                context, repository, original, original.pricing, changes
+            )
+        finally:
+            self._context_pool.release(context)
+
+    def _rebook_with_context(
+        self,
+        context: BookingCalculationContext,
+        repository: BookingRepository,
+        original: Booking,
+        pricing: PricingBreakdown,
+        changes: BookingChanges,
+    ) -> Booking:
+        self.is_processing_booking = True
+
+        flight_number = original.flight_number
+        airline_code = original.airline_code
+        departure_date = _changed(changes.departure_date, original.departure_date)
+        passenger_count = _changed(changes.passenger_count, original.passenger_count)
+        special_requests = _changed(changes.special_requests, original.special_requests)
+        passenger_name = _changed(changes.passenger_name, original.passenger_name)
+        date_changed = departure_date != original.departure_date
+        count_changed = passenger_count != original.passenger_count
+
+        max_retries = self.retry_policy.max_retries(self.booking_counter)
+
+        assigned_seats = original.seat_assignments
+        reserved_seats: List[str] = []
+        try:
+            if date_changed or count_changed:
+                availability_service = create(FlightAvailabilityServiceImpl)(
+                    self._modify_connection_string_for_availability(
+                        context, BOOKING_DATABASE_CONNECTION_STRING, flight_number
+                    )
+                )
+                available_seats = self._retrier.call(
+                    "availability",
+                    max_retries,
+                    availability_service.check_and_get_available_seats_for_booking,
+                    flight_number,
+                    departure_date,
+                    passenger_count,
+                )
+                # On the same departure the party keeps or reuses its own seats
+                held_seats = () if date_changed else original.seat_assignments
+                assigned_seats = self._reserve_seats(
+                    availability_service,
+                    available_seats,
+                    flight_number,
+                    departure_date,
+                    passenger_count,
+                    held_seats,
+                )
+                if len(assigned_seats) < passenger_count:
+                    self.state.last_failure_reason = "Not enough seats"
+                    self.is_processing_booking = False
+                    raise ValueError("Not enough seats available")
+                reserved_seats = [label for label in assigned_seats if label not in held_seats]
+
+                pricing_engine = self._create_pricing_engine(context, repository, flight_number, airline_code)
+                pricing = replace(
+                    pricing,
+                    base_price=pricing_engine.calculate_base_price_with_taxes(
+                        flight_number, departure_date, passenger_count, airline_code
+                    ),
+                )
+
+            if date_changed:
+                # Swap the seasonal part of the bonus; any lucky-booking bonus is kept
+                _, old_season_bonus = self._season_for_month(original.departure_date.month)
+                context.current_season, new_season_bonus = self._season_for_month(departure_date.month)
+                pricing = replace(
+                    pricing,
+                    weekday_multiplier=self._get_weekday_multiplier_and_update_global_state(
+                        context, departure_date
+                    ),
+                    seasonal_bonus=pricing.seasonal_bonus - old_season_bonus + new_season_bonus,
+                )
+            else:
+                context.is_peak_day = self._is_peak_day(departure_date)
+
+            if special_requests != original.special_requests:
+                pricing = replace(
+                    pricing,
+                    special_request_surcharge=self._process_special_requests_and_calculate_surcharge(
+                        context, special_requests, airline_code
+                    ),
+                )
+
+            final_price = pricing.final_price
+            booking_reference = original.booking_reference
+            booking_status = self._determine_booking_status_from_global_state(
+                context, final_price, passenger_count
+            )
+
+            booking = replace(
+                original,
+                passenger_name=passenger_name,
+                departure_date=departure_date,
+                passenger_count=passenger_count,
+                special_requests=special_requests,
+                final_price=final_price,
+                status=booking_status,
+                seat_assignments=assigned_seats,
+                pricing=pricing,
+            )
+            repository.save_booking_record(booking)  # One write replaces details and breakdown
+        except Exception:
+            if reserved_seats:
+                availability_service.release_seats(flight_number, departure_date, reserved_seats)
+            raise
+
+        if date_changed or count_changed:
+            # Only now that the booking points at its new seats can the old ones go
+            released_seats = [
+                label
+                for label in original.seat_assignments
+                if date_changed or label not in assigned_seats
+            ]
+            availability_service.release_seats(
+                flight_number, original.departure_date, released_seats
+            )
+
+        smtp_server = self._determine_smtp_server_from_airline_code(context, airline_code)
+        partner_notifier = create(PartnerNotifierImpl)(smtp_server, self.booking_counter % 2 == 0)
+        audit_logger = create(self._audit_logger_type)(
+            self._calculate_log_directory_from_booking_count(context), self.state.debug_mode
+        )
+
+        audit_logger.log_booking_activity(
+            "Flight Rebooked", booking_reference, f"Passenger: {passenger_name}, Flight: {flight_number}"
+        )
+        audit_logger.record_pricing_breakdown(
+            PricingAuditRecord(
+                booking_reference=booking_reference,
+                flight_number=flight_number,
+                booking_date=self._booking_date,
+                departure_date=departure_date,
+                base_price=pricing.base_price,
+                weekday_multiplier=pricing.weekday_multiplier,
+                seasonal_bonus=pricing.seasonal_bonus,
+                special_request_surcharge=pricing.special_request_surcharge,
+                discount_amount=pricing.discount_amount,
+                final_price=final_price,
+            )
+        )
 
-        self.temporary_data["last_booking_price"] = final_price
-        self.temporary_data["last_booking_date"] = self._booking_date
+        if self._should_notify_partner_based_on_airline_and_state(airline_code):
+            self._retrier.call(
+                "partner_notifier",
+                0,  # Not idempotent, never retried
+                partner_notifier.notify_partner_about_booking,
+                airline_code,
+                booking_reference,
+                final_price,
+                passenger_name,
+                f"{flight_number} departing {departure_date.isoformat()}",
+                True,
+            )
+
+            if (
+                special_requests != original.special_requests
+                and special_requests
+                and self._requires_special_notification(airline_code, special_requests)
+            ):
+                partner_notifier.validate_and_notify_special_requests(
+                    airline_code, special_requests, booking_reference
+                )
+
+        self._retrier.call(
+            "partner_notifier",
+            max_retries,
+            partner_notifier.update_partner_booking_status,
+            airline_code,
+            booking_reference,
+            booking_status,
+        )
         self.is_processing_booking = False
+        return booking
+
+    def _create_repository(self, repository_retries: int) -> BookingRepository:
+        # The repository retries internally, outside the budget
+        return create(BookingRepositoryImpl)(BOOKING_DATABASE_CONNECTION_STRING, repository_retries)
+
+    def _create_pricing_engine(
+        self,
+        context: BookingCalculationContext,
+        repository: BookingRepositoryImpl,
+        flight_number: str,
+        airline_code: str,
+    ) -> PricingEngine:
+        # Calculate pricing engine parameters based on current state
+        tax_rate = self._calculate_tax_rate_based_on_global_state(context, airline_code)
+        airline_fees = self._build_airline_fees_from_coordinator_state(airline_code)
+        enable_random_surcharges = self.booking_counter % 3 == 0  # Enable surcharges every 3rd booking
+        region_code = self._determine_region_from_flight_number(context, flight_number)
+        historical_average = self._get_historical_average_from_repository(repository, flight_number)
+
+        return PricingEngine(
+            tax_rate,
+            airline_fees,
+            enable_random_surcharges,
+            region_code,
+            historical_average,
+            self._booking_date,
+            fee_cache=self._fee_cache,
+            tax_surcharge=self._calculate_failure_tax_surcharge(),
+        )
 
-        return Booking(
-            booking_reference=actual_booking_ref,
-            passenger_name=passenger_name,
-            flight_number=flight_number,
-            departure_date=departure_date,
-            passenger_count=passenger_count,
-            airline_code=airline_code,
-            final_price=final_price,
-            special_requests=special_requests,
-            booking_date=self._booking_date,
-            status=booking_status,
+    def downstream_targets(self, flight_number: str, airline_code: str) -> Tuple[str, str]:
+        """Return the availability database and SMTP host a booking will use.
+
+        Has no side effects, so admission control can call it up front.
+        """
+        return (
+            self._availability_database_for_flight(flight_number),
+            SMTP_SERVERS.get(airline_code, DEFAULT_SMTP_SERVER),
         )
 
+    @staticmethod
+    def _reserve_seats(
+        availability_service: FlightAvailabilityService,
+        available_seats: List[str],
+        flight_number: str,
+        departure_date: datetime,
+        passenger_count: int,
+        held_seats: Sequence[str] = (),
+    ) -> List[str]:
+        """Pick seats for the party and hold them with the availability service.
+
+        The seat map is only a snapshot: seats are picked on a copy and then
+        reserved, and if another booking took some of them in between the map
+        is fetched again. Free seat labels alone say nothing about aisles or
+        full rows, so without a seat map the first free seats are taken.
+        held_seats are the party's current seats on this departure; they count
+        as free and are not reserved again. Returns [] if the party cannot be
+        seated, in which case nothing is reserved.
+        """
+        for _ in range(SEAT_RESERVATION_ATTEMPTS):
+            seat_map = availability_service.get_seat_map(flight_number, departure_date)
+            if seat_map is not None:
+                seat_map = seat_map.copy()
+                for label in held_seats:
+                    seat_map.mark_free(label)
+                assigned_seats = seat_map.allocate(passenger_count)
+            else:
+                candidates = [*held_seats, *(s for s in available_seats if s not in held_seats)]
+                assigned_seats = candidates[:passenger_count]
+            if len(assigned_seats) < passenger_count:
+                return []
+
+            new_seats = [label for label in assigned_seats if label not in held_seats]
+            if availability_service.reserve_seats(flight_number, departure_date, new_seats):
+                return assigned_seats
+        return []
+
+    @staticmethod
+    def _availability_database_for_flight(flight_number: str) -> str:
+        return f"FlightAvailability_{flight_number[:2]}"
+
     def _calculate_retries_based_on_booking_count(self) -> int:
-        self.temporary_data["calculation_count"] = self.temporary_data.get("calculation_count", 0) + 1
-        return min(5, self.booking_counter // 10 + 1)
+        self.state.calculation_count += 1
+        return self.repository_retry_policy.max_retries(self.booking_counter)
 
-    def _calculate_tax_rate_based_on_global_state(self, airline_code: str) -> Decimal:
+    def _calculate_tax_rate_based_on_global_state(
+        self, context: BookingCalculationContext, airline_code: str
+    ) -> Decimal:
         base_rate = Decimal("1.18")
-        if "last_failure_reason" in self.temporary_data:
-            base_rate += Decimal("0.05")
+        base_rate += self._calculate_failure_tax_surcharge()
 
-        self.temporary_data["last_processed_airline"] = airline_code
+        context.processed_airline = airline_code
 
         return base_rate
 
-    def _build_airline_fees_from_temporary_data(self, airline_code: str) -> Dict[str, Decimal]:
+    def _calculate_failure_tax_surcharge(self) -> Decimal:
+        # Also added on top of partner-published tax rates
+        if self.state.last_failure_reason is not None:
+            return Decimal("0.05")
+        return Decimal("0")
+
+    def _build_airline_fees_from_coordinator_state(self, airline_code: str) -> Dict[str, Decimal]:
         fees = {}
 
-        if "last_booking_price" in self.temporary_data:
-            last_price = self.temporary_data["last_booking_price"]
+        if self.state.last_booking_price is not None:
+            last_price = self.state.last_booking_price
             fees[airline_code] = last_price * Decimal("0.02")
         else:
             fees[airline_code] = Decimal("25.0")
@@ -227,8 +657,10 @@ class BookingCoordinatorImpl:
 
         return fees
 
-    def _determine_region_from_flight_number(self, flight_number: str) -> str:
-        self.temporary_data["last_flight_number"] = flight_number
+    def _determine_region_from_flight_number(
+        self, context: BookingCalculationContext, flight_number: str
+    ) -> str:
+        context.flight_number = flight_number
 
         if flight_number.startswith("AA") or flight_number.startswith("UA"):
             return "US"
@@ -238,69 +670,72 @@ class BookingCoordinatorImpl:
             return "INTL"
 
     def _get_historical_average_from_repository(self, repository, flight_number: str) -> Decimal:
-        self.temporary_data["historical_lookup_count"] = (
-            self.temporary_data.get("historical_lookup_count", 0) + 1
-        )
+        self.state.historical_lookup_count += 1
 
         return Decimal(str(450.0 + (len(flight_number) * 10)))
 
     def _modify_connection_string_for_availability(
-        self, original_connection_string: str, flight_number: str
+        self,
+        context: BookingCalculationContext,
+        original_connection_string: str,
+        flight_number: str,
     ) -> str:
         modified = original_connection_string.replace(
-            "FlightBookings", f"FlightAvailability_{flight_number[:2]}"
+            "FlightBookings", self._availability_database_for_flight(flight_number)
         )
 
-        self.temporary_data["last_connection_string"] = modified
+        context.availability_connection_string = modified
 
         return modified
 
-    def _get_weekday_multiplier_and_update_global_state(self, departure_date: datetime) -> Decimal:
-        self.temporary_data["last_departure_date"] = departure_date
+    def _get_weekday_multiplier_and_update_global_state(
+        self, context: BookingCalculationContext, departure_date: datetime
+    ) -> Decimal:
+        context.departure_date = departure_date
+        context.is_peak_day = self._is_peak_day(departure_date)
 
         day_of_week = departure_date.weekday()  # Python: Monday=0, Sunday=6
-        if day_of_week == 4 or day_of_week == 6:  # Friday or Sunday
-            self.temporary_data["is_peak_day"] = True
+        if context.is_peak_day:
             return Decimal("1.25")
         elif day_of_week == 1 or day_of_week == 2:  # Tuesday or Wednesday
-            self.temporary_data["is_peak_day"] = False
             return Decimal("0.9")
 
-        self.temporary_data["is_peak_day"] = False
         return Decimal("1.0")
 
+    @staticmethod
+    def _is_peak_day(departure_date: datetime) -> bool:
+        day_of_week = departure_date.weekday()
+        return day_of_week == 4 or day_of_week == 6  # Friday or Sunday
+
     def _calculate_seasonal_bonus_with_side_effects(
-        self, departure_date: datetime, flight_number: str
+        self, context: BookingCalculationContext, departure_date: datetime, flight_number: str
     ) -> Decimal:
-        month = departure_date.month
-        bonus = Decimal("0.0")
-
-        if 6 <= month <= 8:
-            bonus = Decimal("50.0")
-            self.temporary_data["current_season"] = "Summer"
-        elif month >= 12 or month <= 2:
-            bonus = Decimal("75.0")
-            self.temporary_data["current_season"] = "Winter"
-        else:
-            bonus = Decimal("25.0")
-            self.temporary_data["current_season"] = "OffPeak"
+        context.current_season, bonus = self._season_for_month(departure_date.month)
 
         if self.booking_counter % 5 == 0:
             bonus += Decimal("20.0")
-            self.temporary_data["lucky_booking"] = True
+            context.lucky_booking = True
 
         return bonus
 
+    @staticmethod
+    def _season_for_month(month: int) -> Tuple[str, Decimal]:
+        if 6 <= month <= 8:
+            return "Summer", Decimal("50.0")
+        elif month >= 12 or month <= 2:
+            return "Winter", Decimal("75.0")
+        return "OffPeak", Decimal("25.0")
+
     def _process_special_requests_and_calculate_surcharge(
-        self, special_requests: str, airline_code: str
+        self, context: BookingCalculationContext, special_requests: str, airline_code: str
     ) -> Decimal:
         surcharge = Decimal("0.0")
 
         if not special_requests:
             return surcharge
 
-        self.temporary_data["has_special_requests"] = True
-        self.temporary_data["special_requests_count"] = len(special_requests.split(","))
+        context.has_special_requests = True
+        context.special_requests_count = len(special_requests.split(","))
 
         if "wheelchair" in special_requests:
             surcharge += Decimal("0.0") if airline_code == "AA" else Decimal("25.0")
@@ -313,17 +748,16 @@ class BookingCoordinatorImpl:
 
         return surcharge
 
-    def _determine_smtp_server_from_airline_code(self, airline_code: str) -> str:
-        self.temporary_data["last_smtp_lookup"] = datetime.now()
+    def _determine_smtp_server_from_airline_code(
+        self, context: BookingCalculationContext, airline_code: str
+    ) -> str:
+        context.smtp_lookup_time = datetime.now()
 
-        smtp_servers = {
-            "AA": "smtp.american.com",
-            "UA": "smtp.united.com",
-            "BA": "smtp.britishairways.com",
-        }
-        return smtp_servers.get(airline_code, "smtp.generic-airline.com")
+        return SMTP_SERVERS.get(airline_code, DEFAULT_SMTP_SERVER)
 
-    def _calculate_log_directory_from_booking_count(self) -> str:
+    def _calculate_log_directory_from_booking_count(
+        self, context: BookingCalculationContext
+    ) -> str:
         base_dir = "/var/logs/BookingLogs"
 
         if self.booking_counter > 100:
@@ -333,24 +767,22 @@ class BookingCoordinatorImpl:
         else:
             base_dir += "/LowVolume"
 
-        self.temporary_data["current_log_directory"] = base_dir
+        context.log_directory = base_dir
 
         return base_dir
 
     def _generate_booking_reference_and_update_counters(
-        self, passenger_name: str, flight_number: str
+        self, context: BookingCalculationContext, passenger_name: str, flight_number: str
     ) -> str:
         reference = f"{flight_number}{self.booking_counter:04d}{passenger_name[:min(3, len(passenger_name))].upper()}"
 
-        self.temporary_data["last_generated_reference"] = reference
-        self.temporary_data["reference_generation_count"] = (
-            self.temporary_data.get("reference_generation_count", 0) + 1
-        )
+        context.generated_reference = reference
+        self.state.reference_generation_count += 1
 
         return reference
 
     def _should_notify_partner_based_on_airline_and_state(self, airline_code: str) -> bool:
-        if "last_failure_reason" in self.temporary_data:
+        if self.state.last_failure_reason is not None:
             return False
 
         if self.booking_counter < 5:
@@ -368,11 +800,11 @@ class BookingCoordinatorImpl:
         return len(special_requests.split(",")) > 2
 
     def _determine_booking_status_from_global_state(
-        self, final_price: Decimal, passenger_count: int
+        self, context: BookingCalculationContext, final_price: Decimal, passenger_count: int
     ) -> str:
         status = "CONFIRMED"
 
-        if self.temporary_data.get("is_peak_day", False):
+        if context.is_peak_day:
             status = "CONFIRMED_PEAK"
 
         if final_price > Decimal("1000"):
@@ -381,6 +813,6 @@ class BookingCoordinatorImpl:
         if passenger_count > 5:
             status = "CONFIRMED_GROUP"
 
-        self.temporary_data["last_booking_status"] = status
+        context.booking_status = status
 
         return status
\ No newline at end of file
@@ -0,0 +1,13 @@
+"""Exception for bookings shed by admission control."""
+
+
+class BookingRejectedException(Exception):
+    """Exception thrown when a booking is refused to protect shared capacity."""
+
+    def __init__(self, airline_code: str, reason: str, retry_after: float) -> None:
+        super().__init__(
+            f"Booking for {airline_code} rejected ({reason}), retry after {retry_after:.3f}s"
+        )
+        self.airline_code = airline_code
+        self.reason = reason
+        self.retry_after = retry_after
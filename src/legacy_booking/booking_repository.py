@@ -3,7 +3,9 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Tuple
+
+from .booking import Booking
 
 
 class BookingRepository(ABC):
@@ -33,4 +35,18 @@ class BookingRepository(ABC):
         self, flight_number: str, date: datetime, day_range: int
     ) -> Decimal:
         """Get historical pricing data."""
+        pass
+
+    @abstractmethod
+    def save_booking_record(self, booking: Booking) -> None:
+        """Store the complete booking, including seats and pricing breakdown.
+
+        Replaces the details saved under the same reference, so a rebooking
+        is a single write.
+        """
+        pass
+
+    @abstractmethod
+    def get_booking_record(self, booking_reference: str) -> Optional[Booking]:
+        """Load a booking stored by save_booking_record, if it exists."""
         pass
\ No newline at end of file
@@ -2,8 +2,9 @@
 
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Tuple
 
+from .booking import Booking
 from .booking_repository import BookingRepository
 from .can_not_use_in_tests_exception import CanNotUseInTestsException
 
@@ -30,4 +31,10 @@ class BookingRepositoryImpl(BookingRepository):
     def get_historical_pricing_data(
         self, flight_number: str, date: datetime, day_range: int
     ) -> Decimal:
-        raise CanNotUseInTestsException("BookingRepositoryImpl")
\ No newline at end of file
+        raise CanNotUseInTestsException("BookingRepositoryImpl")
+
+    def save_booking_record(self, booking: Booking) -> None:
+        raise CanNotUseInTestsException("BookingRepositoryImpl")
+
+    def get_booking_record(self, booking_reference: str) -> Optional[Booking]:
+        raise CanNotUseInTestsException("BookingRepositoryImpl")
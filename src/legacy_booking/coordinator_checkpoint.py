@@ -0,0 +1,166 @@
+"""Append-only checkpoint journal for coordinator state.
+
+The booking counter drives pricing and booking references, so losing it
+on restart changes prices and can reuse references. Each journal line is a
+complete JSON snapshot; the last intact line wins, and the journal is
+compacted to that line once it grows past a threshold.
+
+To keep the overhead low, a snapshot is not written on every booking.
+Instead each snapshot leases the next ``interval`` counter values. The
+lease is written ahead, as soon as the counter moves past the previous
+one and before the new value is used. After a crash the coordinator
+resumes at the end of the lease, so references are never reused (at
+worst up to ``interval`` numbers are skipped). A clean shutdown records
+the exact state.
+
+Lease records are fsynced by default, so the guarantee also holds when
+the machine loses power. With ``fsync=False`` it only covers crashes of
+the process.
+"""
+
+import json
+import os
+from datetime import datetime
+from decimal import Decimal
+from typing import IO, TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .booking_coordinator_impl import BookingCoordinatorImpl
+
+JOURNAL_VERSION = 1
+
+
+class CoordinatorCheckpoint:
+    """Journals coordinator state to a local file and restores it on startup."""
+
+    def __init__(
+        self, path: str, interval: int = 50, compact_after: int = 1000, fsync: bool = True
+    ) -> None:
+        self.path = path
+        self.interval = interval
+        self.compact_after = compact_after
+        self.fsync = fsync
+        self._journal: Optional[IO[str]] = None
+        self._entries = 0  # Lines in the journal since the last compaction
+        self._lease = 0  # Highest counter value covered by the last snapshot
+        self._last_line = ""
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Return the newest intact snapshot, or None for a fresh start."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as journal:
+                lines = journal.read().splitlines()
+        except FileNotFoundError:
+            return None
+
+        self._entries = len(lines)
+        for line in reversed(lines):  # A crash may leave a torn last line
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get("version") == JOURNAL_VERSION:
+                self._last_line = line
+                return entry
+        return None
+
+    def restore(self, coordinator: "BookingCoordinatorImpl") -> bool:
+        """Load the newest snapshot into the coordinator; return whether one existed."""
+        entry = self.load()
+        if entry is None:
+            return False
+
+        coordinator.booking_counter = entry["counter"]
+        coordinator.last_booking_ref = entry["last_booking_ref"]
+        state = coordinator.state
+        stored = entry["state"]
+        state.last_booking_price = _decimal(stored["last_booking_price"])
+        state.last_booking_date = _datetime(stored["last_booking_date"])
+        state.last_failure_reason = stored["last_failure_reason"]
+        state.debug_mode = stored["debug_mode"]
+        state.calculation_count = stored["calculation_count"]
+        state.historical_lookup_count = stored["historical_lookup_count"]
+        state.reference_generation_count = stored["reference_generation_count"]
+        self._lease = coordinator.booking_counter
+        return True
+
+    def reserve(self, coordinator: "BookingCoordinatorImpl") -> None:
+        """Lease the next counter values once the current lease is used up.
+
+        Called right after the counter is incremented, before the new value
+        is used, so a booking that fails later cannot leave it unrecorded.
+        """
+        if coordinator.booking_counter > self._lease:
+            self.record(coordinator, coordinator.booking_counter + self.interval)
+
+    def record(self, coordinator: "BookingCoordinatorImpl", lease: Optional[int] = None) -> None:
+        """Append a snapshot; without a lease the exact counter is stored."""
+        state = coordinator.state
+        self._lease = coordinator.booking_counter if lease is None else lease
+        entry = {
+            "version": JOURNAL_VERSION,
+            "counter": self._lease,
+            "last_booking_ref": coordinator.last_booking_ref,
+            "state": {
+                "last_booking_price": _optional_str(state.last_booking_price),
+                "last_booking_date": _optional_isoformat(state.last_booking_date),
+                "last_failure_reason": state.last_failure_reason,
+                "debug_mode": state.debug_mode,
+                "calculation_count": state.calculation_count,
+                "historical_lookup_count": state.historical_lookup_count,
+                "reference_generation_count": state.reference_generation_count,
+            },
+        }
+        self._last_line = json.dumps(entry, separators=(",", ":"))
+
+        journal = self._open_journal()
+        journal.write(self._last_line + "\n")
+        journal.flush()
+        if self.fsync:
+            os.fsync(journal.fileno())
+        self._entries += 1
+
+        if self._entries >= self.compact_after:
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the journal to just its newest snapshot, atomically."""
+        if not self._last_line:
+            return
+        self.close()
+
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as compacted:
+            compacted.write(self._last_line + "\n")
+            compacted.flush()
+            if self.fsync:
+                os.fsync(compacted.fileno())
+        os.replace(temporary_path, self.path)
+        self._entries = 1
+
+    def close(self) -> None:
+        """Close the journal file; the next record reopens it."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def _open_journal(self) -> IO[str]:
+        if self._journal is None:
+            self._journal = open(self.path, "a", encoding="utf-8")
+        return self._journal
+
+
+def _optional_str(value: Optional[Decimal]) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _optional_isoformat(value: Optional[datetime]) -> Optional[str]:
+    return None if value is None else value.isoformat()
+
+
+def _decimal(value: Optional[str]) -> Optional[Decimal]:
+    return None if value is None else Decimal(value)
+
+
+def _datetime(value: Optional[str]) -> Optional[datetime]:
+    return None if value is None else datetime.fromisoformat(value)
@@ -2,7 +2,9 @@
 
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List
+from typing import List, Optional, Sequence
+
+from .seat_map import SeatMap
 
 
 class FlightAvailabilityService(ABC):
@@ -20,4 +22,27 @@ class FlightAvailabilityService(ABC):
         self, flight_number: str, departure_date: datetime
     ) -> bool:
         """Check if flight is fully booked."""
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def reserve_seats(
+        self, flight_number: str, departure_date: datetime, seat_labels: Sequence[str]
+    ) -> bool:
+        """Hold seats for a booking; all of them, or none if any is taken."""
+        pass
+
+    @abstractmethod
+    def release_seats(
+        self, flight_number: str, departure_date: datetime, seat_labels: Sequence[str]
+    ) -> None:
+        """Give held seats back."""
+        pass
+
+    def get_seat_map(self, flight_number: str, departure_date: datetime) -> Optional[SeatMap]:
+        """Return the cabin layout with free seats, if the service knows it.
+
+        The map is a snapshot; seats only count as taken once reserve_seats
+        accepts them. The default returns None; the coordinator then takes
+        the first free seats without trying to seat the party together.
+        """
+        return None
\ No newline at end of file
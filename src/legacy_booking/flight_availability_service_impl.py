@@ -1,10 +1,11 @@
 """Flight availability service implementation."""
 
 from datetime import datetime
-from typing import List
+from typing import List, Optional, Sequence
 
 from .flight_availability_service import FlightAvailabilityService
 from .can_not_use_in_tests_exception import CanNotUseInTestsException
+from .seat_map import SeatMap
 
 
 class FlightAvailabilityServiceImpl(FlightAvailabilityService):
@@ -21,4 +22,17 @@ class FlightAvailabilityServiceImpl(FlightAvailabilityService):
     def is_flight_fully_booked(
         self, flight_number: str, departure_date: datetime
     ) -> bool:
+        raise CanNotUseInTestsException("FlightAvailabilityServiceImpl")
+
+    def reserve_seats(
+        self, flight_number: str, departure_date: datetime, seat_labels: Sequence[str]
+    ) -> bool:
+        raise CanNotUseInTestsException("FlightAvailabilityServiceImpl")
+
+    def release_seats(
+        self, flight_number: str, departure_date: datetime, seat_labels: Sequence[str]
+    ) -> None:
+        raise CanNotUseInTestsException("FlightAvailabilityServiceImpl")
+
+    def get_seat_map(self, flight_number: str, departure_date: datetime) -> Optional[SeatMap]:
         raise CanNotUseInTestsException("FlightAvailabilityServiceImpl")
\ No newline at end of file
@@ -7,10 +7,12 @@ Updated 2019: Now supports multi-currency
 import random
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 from global_object_factory import create
 
+from .airline_fee_cache import AirlineFeeCache, get_shared_fee_cache
+
 
 class PricingEngine:
     """Handles all pricing calculations with legacy patterns."""
@@ -22,6 +24,9 @@ class PricingEngine:
         apply_random_surcharges: bool,
         region_code: str,
         average_flight_cost: Decimal,
+        booking_date: Optional[datetime] = None,
+        fee_cache: Optional[AirlineFeeCache] = None,
+        tax_surcharge: Decimal = Decimal("0"),
     ) -> None:
         """Initialize pricing engine with configuration.
 
@@ -33,6 +38,10 @@ class PricingEngine:
         self.enable_dynamic_pricing = apply_random_surcharges  # Enable/disable dynamic pricing
         self.currency_code = region_code  # Currency code for this pricing instance
         self.historical_data = average_flight_cost  # Historical pricing data for calculations
+        self.booking_date = booking_date  # Reference date for time-based markups (None means now)
+        # Airline fee/tax tables shared process-wide
+        self.fee_cache = fee_cache if fee_cache is not None else get_shared_fee_cache()
+        self.tax_surcharge = tax_surcharge  # Already part of tax_rate; added to published rates too
 
     def calculate_base_price_with_taxes(
         self,
@@ -45,17 +54,28 @@ class PricingEngine:
 
         Returns the final price ready for booking confirmation.
         """
+        # Read one consistent version of the shared fee and tax tables
+        fee_table = self.fee_cache.snapshot()
+
         # Start with standard base price for all flights
         price_before_calculation = Decimal("299.99")
         time_based_adjustment = self.calculate_time_based_markup(departure_date)
         passenger_multiplier = Decimal(str(passenger_count)) * Decimal("0.95")  # Group discount
 
-        # Apply tax multiplier to base price
-        with_taxes = price_before_calculation * self.base_multiplier
+        # Apply tax multiplier to base price (a partner-published rate replaces the base rate)
+        published_tax_rate = fee_table.tax_rates.get(airline_code)
+        if published_tax_rate is None:
+            tax_rate = self.base_multiplier
+        else:
+            tax_rate = published_tax_rate + self.tax_surcharge
+        with_taxes = price_before_calculation * tax_rate
 
-        # Add airline-specific seasonal adjustments if configured
-        if airline_code in self.seasonal_adjustments:
-            with_taxes += self.seasonal_adjustments[airline_code] * Decimal(str(passenger_count))
+        # Add the airline-specific adjustment plus any partner-published airline fee
+        airline_fee = self.seasonal_adjustments.get(airline_code, Decimal("0")) + fee_table.fees.get(
+            airline_code, Decimal("0")
+        )
+        if airline_fee:
+            with_taxes += airline_fee * Decimal(str(passenger_count))
 
         # Apply historical data adjustment (weighted average)
         final_adjustment = with_taxes * (self.historical_data / Decimal("1000"))
@@ -67,7 +87,7 @@ class PricingEngine:
 
         Business rule: Early bookings get discount, last-minute bookings get surcharge.
         """
-        days_until_flight = (departure_date - datetime.now()).days
+        days_until_flight = (departure_date - (self.booking_date or datetime.now())).days
 
         if days_until_flight < 7:
             return Decimal("150.0")  # Last minute surcharge
@@ -79,13 +99,19 @@ class PricingEngine:
     def get_airline_specific_fees_and_update_cache(
         self, airline_code: str, passenger_count: int
     ) -> Decimal:
-        """Retrieve airline-specific fees and cache for future lookups."""
-        # Create default fee structure if airline not in cache
-        if airline_code not in self.seasonal_adjustments:
-            # Calculate base fee from airline code (legacy algorithm from 2015)
-            self.seasonal_adjustments[airline_code] = Decimal(str(len(airline_code))) * Decimal("12.5")
+        """Retrieve airline-specific fees and cache for future lookups.
 
-        return self.seasonal_adjustments[airline_code] * Decimal(str(passenger_count))
+        The cache is shared by every PricingEngine in the process.
+        """
+        if airline_code in self.seasonal_adjustments:
+            return self.seasonal_adjustments[airline_code] * Decimal(str(passenger_count))
+
+        # Calculate base fee from airline code (legacy algorithm from 2015) on a cache miss;
+        # it is cached apart from partner-published fees and never charged on bookings
+        fee = self.fee_cache.get_or_compute_fee(
+            airline_code, lambda: Decimal(str(len(airline_code))) * Decimal("12.5")
+        )
+        return fee * Decimal(str(passenger_count))
 
     def validate_pricing_parameters_and_calculate_discount(
         self, flight_number: str
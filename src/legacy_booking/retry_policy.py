@@ -0,0 +1,224 @@
+"""Retry policies, budgets and the retrier shared by the booking services.
+
+Retries are capped twice: a policy decides how often a single call may be
+retried, and a budget caps retries as a fraction of overall traffic so an
+outage cannot turn into a retry storm. The budget only works when it sees
+all traffic, so coordinators share one process-wide budget and metrics
+unless they are given their own.
+"""
+
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Callable, Dict, Optional, Tuple, Type, TypeVar
+
+from .can_not_use_in_tests_exception import CanNotUseInTestsException
+
+T = TypeVar("T")
+
+DEFAULT_RETRYABLE_ERRORS: Tuple[Type[BaseException], ...] = (ConnectionError, TimeoutError)
+
+
+class RetryPolicy(ABC):
+    """Abstract interface for deciding how and how often to retry."""
+
+    @abstractmethod
+    def max_retries(self, booking_counter: int) -> int:
+        """Return how many times a failed call may be retried."""
+        pass
+
+    def backoff_delay(self, retry_number: int) -> float:
+        """Return the seconds to wait before the given retry (1-based)."""
+        return 0.0
+
+
+class BookingCountRetryPolicy(RetryPolicy):
+    """Legacy policy: one more retry for every ten bookings, up to five.
+
+    NOTE: Retries grow with load, which is exactly when they hurt most.
+    Still used for the repository's internal retries so its configuration
+    does not change.
+    """
+
+    def max_retries(self, booking_counter: int) -> int:
+        return min(5, booking_counter // 10 + 1)
+
+
+class FixedRetryPolicy(RetryPolicy):
+    """Same number of retries and the same delay for every call."""
+
+    def __init__(self, retries: int, delay: float = 0.0) -> None:
+        self.retries = retries
+        self.delay = delay
+
+    def max_retries(self, booking_counter: int) -> int:
+        return self.retries
+
+    def backoff_delay(self, retry_number: int) -> float:
+        return self.delay
+
+
+class ExponentialBackoffRetryPolicy(RetryPolicy):
+    """Doubles the delay on every retry, with optional full jitter."""
+
+    def __init__(
+        self,
+        retries: int = 3,
+        base_delay: float = 0.05,
+        max_delay: float = 2.0,
+        jitter: bool = True,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self._rng = rng or random.Random()
+
+    def max_retries(self, booking_counter: int) -> int:
+        return self.retries
+
+    def backoff_delay(self, retry_number: int) -> float:
+        delay = min(self.max_delay, self.base_delay * (2 ** (retry_number - 1)))
+        if self.jitter:
+            return self._rng.uniform(0.0, delay)
+        return delay
+
+
+class RetryBudget:
+    """Caps retries at a percentage of the request rate.
+
+    Every request deposits ``retry_ratio`` tokens and every retry withdraws
+    one, so with the default ratio at most one call in ten is retried once
+    the initial allowance is spent.
+    """
+
+    def __init__(self, retry_ratio: float = 0.1, max_tokens: float = 10.0) -> None:
+        self.retry_ratio = retry_ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        """Credit the budget for one first attempt."""
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.retry_ratio)
+
+    def try_spend(self) -> bool:
+        """Withdraw one retry if the budget allows it."""
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+    def available(self) -> int:
+        """Return the number of retries the budget could pay for right now."""
+        with self._lock:
+            return int(self._tokens)
+
+
+class RetryMetrics:
+    """Thread-safe counters describing what the retrier has been doing."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.retries = 0
+        self.budget_exhausted = 0  # Retries refused by the budget
+        self.retries_exhausted = 0  # Calls that failed after their last retry
+        self.non_retryable_failures = 0
+        self.retries_by_target: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record_call(self) -> None:
+        """Count one first attempt."""
+        with self._lock:
+            self.calls += 1
+
+    def record_retry(self, target: str) -> None:
+        """Count one retry against a target."""
+        with self._lock:
+            self.retries += 1
+            self.retries_by_target[target] += 1
+
+    def record_budget_exhausted(self) -> None:
+        """Count a retry the budget refused."""
+        with self._lock:
+            self.budget_exhausted += 1
+
+    def record_retries_exhausted(self) -> None:
+        """Count a call that failed after its last retry."""
+        with self._lock:
+            self.retries_exhausted += 1
+
+    def record_non_retryable_failure(self) -> None:
+        """Count a call that failed with a permanent error."""
+        with self._lock:
+            self.non_retryable_failures += 1
+
+
+_shared_budget = RetryBudget()
+_shared_metrics = RetryMetrics()
+
+
+def get_shared_retry_budget() -> RetryBudget:
+    """Return the retry budget shared by every coordinator in this process."""
+    return _shared_budget
+
+
+def get_shared_retry_metrics() -> RetryMetrics:
+    """Return the retry metrics shared by every coordinator in this process."""
+    return _shared_metrics
+
+
+class Retrier:
+    """Runs calls under a retry policy, a retry budget and error classification."""
+
+    def __init__(
+        self,
+        policy: RetryPolicy,
+        budget: Optional[RetryBudget] = None,
+        metrics: Optional[RetryMetrics] = None,
+        retryable_errors: Tuple[Type[BaseException], ...] = DEFAULT_RETRYABLE_ERRORS,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.policy = policy
+        self.budget = budget or RetryBudget()
+        self.metrics = metrics or RetryMetrics()
+        self.retryable_errors = retryable_errors
+        self._sleep = sleep
+
+    def is_retryable(self, error: BaseException) -> bool:
+        """Classify an error as transient (worth retrying) or permanent."""
+        if isinstance(error, CanNotUseInTestsException):
+            return False
+        return isinstance(error, self.retryable_errors)
+
+    def call(self, target: str, max_retries: int, operation: Callable[..., T], *args: object) -> T:
+        """Call operation, retrying transient failures up to max_retries times."""
+        self.metrics.record_call()
+        self.budget.record_request()
+
+        retry_number = 0
+        while True:
+            try:
+                return operation(*args)
+            except Exception as error:
+                if not self.is_retryable(error):
+                    self.metrics.record_non_retryable_failure()
+                    raise
+                if retry_number >= max_retries:
+                    self.metrics.record_retries_exhausted()
+                    raise
+                if not self.budget.try_spend():
+                    self.metrics.record_budget_exhausted()
+                    raise
+
+            retry_number += 1
+            self.metrics.record_retry(target)
+
+            delay = self.policy.backoff_delay(retry_number)
+            if delay > 0:
+                self._sleep(delay)
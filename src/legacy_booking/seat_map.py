@@ -0,0 +1,223 @@
+"""Seat map with one bitset per row, used to seat groups together.
+
+Bit i of a row is set when the seat at layout position i is free. Aisles
+occupy a position that is never free, so runs of set bits never cross them.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_CABIN = "Y"
+
+_SEAT_LABEL = re.compile(r"^(\d+)([A-Z])$")
+
+
+def _run_starts(mask: int, length: int) -> int:
+    """Return a mask with bit i set where bits i..i+length-1 of mask are all set."""
+    starts = mask
+    covered = 1
+    while covered < length and starts:
+        step = min(covered, length - covered)
+        starts &= starts >> step
+        covered += step
+    return starts
+
+
+def _longest_run(mask: int) -> Tuple[int, int]:
+    """Return (length, start) of the longest run of set bits, lowest start first."""
+    length = 0
+    starts = mask
+    while starts:
+        previous = starts
+        starts &= starts >> 1
+        length += 1
+    if length == 0:
+        return 0, 0
+    lowest = previous & -previous
+    return length, lowest.bit_length() - 1
+
+
+class SeatMap:
+    """Free seats of one flight, one integer bitset per row and cabin.
+
+    The layout lists the seat letters of a row from window to window, with a
+    space for each aisle, e.g. ``"ABC DEFG HJK"``.
+    """
+
+    def __init__(self, layout: str = "ABC DEF") -> None:
+        self.layout = layout
+        self._positions: Dict[str, int] = {
+            letter: position for position, letter in enumerate(layout) if letter != " "
+        }
+        self._rows: Dict[int, int] = {}  # Row number -> free seat bitset
+        self._cabins: Dict[str, List[int]] = {}  # Cabin -> row numbers, front to back
+        self._neighbours_dirty = False
+
+    @classmethod
+    def from_available_seats(
+        cls, seat_labels: Iterable[str], layout: str, rows: Iterable[int]
+    ) -> "SeatMap":
+        """Build a single-cabin map from labels such as ``"12C"``.
+
+        Adjacency can only be trusted with the real layout and every row of
+        the cabin, including full ones, so both are required. Raises
+        ValueError for labels that do not parse or fall outside the rows.
+        """
+        seat_map = cls(layout)
+        for row in rows:
+            seat_map.add_row(row)
+        for label in seat_labels:
+            row, letter = cls._parse_label(label)
+            if row not in seat_map._rows or letter not in seat_map._positions:
+                raise ValueError(f"Seat {label} is not part of the layout")
+            seat_map._rows[row] |= 1 << seat_map._positions[letter]
+        return seat_map
+
+    @staticmethod
+    def _parse_label(label: str) -> Tuple[int, str]:
+        match = _SEAT_LABEL.match(label)
+        if match is None:
+            raise ValueError(f"Invalid seat label: {label}")
+        return int(match.group(1)), match.group(2)
+
+    def add_row(self, row: int, cabin: str = DEFAULT_CABIN, free: bool = False) -> None:
+        """Add a row to a cabin, optionally with every seat free."""
+        mask = 0
+        if free:
+            for position in self._positions.values():
+                mask |= 1 << position
+        self._rows[row] = mask
+        self._cabins.setdefault(cabin, []).append(row)
+        self._neighbours_dirty = True
+
+    def copy(self) -> "SeatMap":
+        """Return an independent map with the same layout and free seats."""
+        clone = SeatMap(self.layout)
+        clone._rows = dict(self._rows)
+        clone._cabins = {cabin: list(rows) for cabin, rows in self._cabins.items()}
+        clone._neighbours_dirty = self._neighbours_dirty
+        return clone
+
+    def mark_occupied(self, label: str) -> None:
+        """Mark a single seat as taken."""
+        row, letter = self._parse_label(label)
+        self._rows[row] &= ~(1 << self._positions[letter])
+
+    def mark_free(self, label: str) -> bool:
+        """Give a taken seat back; return whether it was taken.
+
+        Seats that are not on the map are ignored; they may have been
+        assigned before the layout was known.
+        """
+        match = _SEAT_LABEL.match(label)
+        if match is None:
+            return False
+        row, letter = int(match.group(1)), match.group(2)
+        if row not in self._rows or letter not in self._positions:
+            return False
+        bit = 1 << self._positions[letter]
+        if self._rows[row] & bit:
+            return False
+        self._rows[row] |= bit
+        return True
+
+    def is_free(self, label: str) -> bool:
+        """Return whether a seat is free."""
+        row, letter = self._parse_label(label)
+        return bool(self._rows.get(row, 0) >> self._positions[letter] & 1)
+
+    def free_count(self) -> int:
+        """Return the number of free seats on the flight."""
+        return sum(bin(mask).count("1") for mask in self._rows.values())
+
+    def allocate(self, count: int) -> List[str]:
+        """Reserve count seats, as close together as the map allows.
+
+        Tries, in order: a run that exactly fills a gap in one row, any run in
+        one row, the fewest neighbouring rows of one cabin, and finally any
+        free seats. Returns an empty list when the flight has too few seats.
+        """
+        if count <= 0:
+            return []
+        if self.free_count() < count:
+            return []
+
+        seats = self._find_in_single_row(count)
+        if seats is None:
+            seats = self._find_across_neighbouring_rows(count)
+        if seats is None:
+            seats = self._find_anywhere(count)
+
+        for row, position in seats:
+            self._rows[row] &= ~(1 << position)
+        return [self._label(row, position) for row, position in seats]
+
+    def _rows_in_order(self) -> Dict[str, List[int]]:
+        if self._neighbours_dirty:
+            for rows in self._cabins.values():
+                rows.sort()
+            self._neighbours_dirty = False
+        return self._cabins
+
+    def _find_in_single_row(self, count: int) -> Optional[List[Tuple[int, int]]]:
+        first_fit: Optional[Tuple[int, int]] = None
+        for rows in self._rows_in_order().values():
+            for row in rows:
+                mask = self._rows[row]
+                starts = _run_starts(mask, count)
+                if not starts:
+                    continue
+                # Prefer runs bounded by taken seats or aisles on both sides
+                exact = starts & ~(mask << 1) & ~(mask >> count)
+                if exact:
+                    return self._run(row, (exact & -exact).bit_length() - 1, count)
+                if first_fit is None:
+                    first_fit = (row, (starts & -starts).bit_length() - 1)
+        if first_fit is None:
+            return None
+        return self._run(first_fit[0], first_fit[1], count)
+
+    def _find_across_neighbouring_rows(self, count: int) -> Optional[List[Tuple[int, int]]]:
+        cabins = self._rows_in_order()
+        longest = {row: _longest_run(mask) for row, mask in self._rows.items()}
+        prefix_sums = {}
+        for cabin, rows in cabins.items():
+            sums = [0]
+            for row in rows:
+                sums.append(sums[-1] + longest[row][0])
+            prefix_sums[cabin] = sums
+
+        widest_cabin = max((len(rows) for rows in cabins.values()), default=0)
+        for window in range(2, widest_cabin + 1):
+            for cabin, rows in cabins.items():
+                sums = prefix_sums[cabin]
+                for first in range(len(rows) - window + 1):
+                    if sums[first + window] - sums[first] < count:
+                        continue
+                    seats: List[Tuple[int, int]] = []
+                    for row in rows[first:first + window]:
+                        length, start = longest[row]
+                        take = min(length, count - len(seats))
+                        seats.extend(self._run(row, start, take))
+                    return seats
+        return None
+
+    def _find_anywhere(self, count: int) -> List[Tuple[int, int]]:
+        seats: List[Tuple[int, int]] = []
+        for rows in self._rows_in_order().values():
+            for row in rows:
+                mask = self._rows[row]
+                while mask and len(seats) < count:
+                    lowest = mask & -mask
+                    seats.append((row, lowest.bit_length() - 1))
+                    mask ^= lowest
+                if len(seats) == count:
+                    return seats
+        return seats
+
+    @staticmethod
+    def _run(row: int, start: int, length: int) -> List[Tuple[int, int]]:
+        return [(row, position) for position in range(start, start + length)]
+
+    def _label(self, row: int, position: int) -> str:
+        return f"{row}{self.layout[position]}"
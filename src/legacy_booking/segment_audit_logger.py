@@ -0,0 +1,157 @@
+"""Audit logger that stores pricing records in binary segments.
+
+Pricing records are appended to an in-memory AuditSegmentWriter and written
+out as a new segment file once it holds records_per_segment records, or
+when the logs are flushed. Activity and error lines go to a plain text
+file next to the segments.
+
+The coordinator creates a logger per booking, so every logger for the same
+directory shares one process-wide AuditSegmentLog. Records still in memory
+are lost if the process dies before the next roll or flush.
+"""
+
+import os
+import re
+import threading
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Optional, TextIO
+
+from .audit_log_reader import SEGMENT_SUFFIX
+from .audit_logger import AuditLogger
+from .audit_record import AuditSegmentWriter, PricingAuditRecord
+
+SEGMENT_PREFIX = "pricing-"
+ACTIVITY_LOG_NAME = "activity.log"
+DEFAULT_RECORDS_PER_SEGMENT = 10_000
+
+_SEGMENT_NAME = re.compile(rf"^{SEGMENT_PREFIX}(\d+){re.escape(SEGMENT_SUFFIX)}$")
+
+
+class AuditSegmentLog:
+    """Rolling segment files and the activity log of one log directory."""
+
+    def __init__(self, directory: str, records_per_segment: int = DEFAULT_RECORDS_PER_SEGMENT) -> None:
+        self.directory = directory
+        self.records_per_segment = records_per_segment
+        self._lock = threading.Lock()
+        self._writer = AuditSegmentWriter()
+        self._next_segment: Optional[int] = None  # Found lazily, the directory may not exist yet
+        self._activity: Optional[TextIO] = None
+
+    def append(self, record: PricingAuditRecord) -> None:
+        """Add a record, rolling to a new segment when the current one is full."""
+        with self._lock:
+            self._writer.append(record)
+            if len(self._writer) >= self.records_per_segment:
+                self._roll_locked()
+
+    def write_line(self, line: str, flush: bool = False) -> None:
+        """Append a line to the activity log."""
+        with self._lock:
+            activity = self._open_activity_locked()
+            activity.write(line + "\n")
+            if flush:
+                activity.flush()
+
+    def flush(self) -> None:
+        """Write out pending records as a segment and flush the activity log."""
+        with self._lock:
+            if len(self._writer):
+                self._roll_locked()
+            if self._activity is not None:
+                self._activity.flush()
+
+    def pending(self) -> int:
+        """Return how many records are not yet written to a segment."""
+        with self._lock:
+            return len(self._writer)
+
+    def _roll_locked(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        if self._next_segment is None:
+            self._next_segment = self._find_next_segment_number()
+
+        path = os.path.join(self.directory, f"{SEGMENT_PREFIX}{self._next_segment:06d}{SEGMENT_SUFFIX}")
+        temporary_path = path + ".tmp"  # Readers only pick up complete segments
+        with open(temporary_path, "wb") as stream:
+            self._writer.write_to(stream)
+        os.replace(temporary_path, path)
+
+        self._next_segment += 1
+        self._writer = AuditSegmentWriter()
+
+    def _find_next_segment_number(self) -> int:
+        numbers = [
+            int(match.group(1))
+            for match in map(_SEGMENT_NAME.match, os.listdir(self.directory))
+            if match is not None
+        ]
+        return max(numbers, default=0) + 1
+
+    def _open_activity_locked(self) -> TextIO:
+        if self._activity is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._activity = open(
+                os.path.join(self.directory, ACTIVITY_LOG_NAME), "a", encoding="utf-8"
+            )
+        return self._activity
+
+
+_segment_logs: Dict[str, AuditSegmentLog] = {}
+_segment_logs_lock = threading.Lock()
+
+
+def get_segment_log(
+    directory: str, records_per_segment: int = DEFAULT_RECORDS_PER_SEGMENT
+) -> AuditSegmentLog:
+    """Return the process-wide segment log for a directory.
+
+    records_per_segment only applies when the log is first created.
+    """
+    with _segment_logs_lock:
+        segment_log = _segment_logs.get(directory)
+        if segment_log is None:
+            segment_log = AuditSegmentLog(directory, records_per_segment)
+            _segment_logs[directory] = segment_log
+        return segment_log
+
+
+class SegmentAuditLogger(AuditLogger):
+    """Audit logger writing pricing records to rolling binary segments."""
+
+    def __init__(
+        self,
+        log_directory: str,
+        verbose_mode: bool,
+        records_per_segment: int = DEFAULT_RECORDS_PER_SEGMENT,
+    ) -> None:
+        self.verbose_mode = verbose_mode
+        self.segment_log = get_segment_log(log_directory, records_per_segment)
+
+    def log_booking_activity(
+        self, activity: str, booking_reference: str, user_info: str
+    ) -> None:
+        self.segment_log.write_line(
+            f"[{datetime.now().isoformat()}] {activity} {booking_reference}: {user_info}"
+        )
+
+    def record_pricing_calculation(
+        self, calculation_details: str, final_price: Decimal, flight_info: str
+    ) -> None:
+        self.segment_log.write_line(f"{flight_info}: {calculation_details} => {final_price}")
+
+    def record_pricing_breakdown(self, record: PricingAuditRecord) -> None:
+        self.segment_log.append(record)
+        if self.verbose_mode:
+            self.segment_log.write_line(record.render())
+
+    def log_error_with_alert(
+        self, ex: Exception, context: str, booking_ref: str
+    ) -> None:
+        self.segment_log.write_line(
+            f"[{datetime.now().isoformat()}] ERROR {booking_ref} {context}: {ex!r}", flush=True
+        )
+
+    def flush_and_archive_logs(self) -> None:
+        self.segment_log.flush()
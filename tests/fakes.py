@@ -0,0 +1,113 @@
+"""Minimal test doubles for the untestable production services."""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from legacy_booking.audit_logger import AuditLogger
+from legacy_booking.audit_record import PricingAuditRecord
+from legacy_booking.booking import Booking
+from legacy_booking.booking_repository import BookingRepository
+from legacy_booking.flight_availability_service import FlightAvailabilityService
+from legacy_booking.partner_notifier import PartnerNotifier
+
+
+class BookingRepositoryStub(BookingRepository):
+    """Returns a fixed reference and keeps only the booking records."""
+
+    def __init__(self, reference: str = "REF-0001") -> None:
+        self.reference = reference
+        self.records: Dict[str, Booking] = {}
+
+    def save_booking_details(
+        self, passenger_name: str, flight_details: str, price: Decimal, booking_date: datetime
+    ) -> str:
+        return self.reference
+
+    def get_booking_info(self, booking_reference: str) -> Dict[str, Any]:
+        return {}
+
+    def validate_and_enrich_booking_data(self, booking_ref: str) -> Tuple[bool, Decimal, str]:
+        return True, Decimal("0"), ""
+
+    def get_historical_pricing_data(
+        self, flight_number: str, date: datetime, day_range: int
+    ) -> Decimal:
+        return Decimal("0")
+
+    def save_booking_record(self, booking: Booking) -> None:
+        self.records[booking.booking_reference] = booking
+
+    def get_booking_record(self, booking_reference: str) -> Optional[Booking]:
+        return self.records.get(booking_reference)
+
+
+class FlightAvailabilityServiceStub(FlightAvailabilityService):
+    """Reports a fixed list of free seats and accepts every reservation."""
+
+    def __init__(self, seats: int = 50) -> None:
+        self.seats = [f"{row}A" for row in range(1, seats + 1)]
+
+    def check_and_get_available_seats_for_booking(
+        self, flight_number: str, departure_date: datetime, passenger_count: int
+    ) -> List[str]:
+        return self.seats
+
+    def is_flight_fully_booked(self, flight_number: str, departure_date: datetime) -> bool:
+        return False
+
+    def reserve_seats(
+        self, flight_number: str, departure_date: datetime, seat_labels: Sequence[str]
+    ) -> bool:
+        return True
+
+    def release_seats(
+        self, flight_number: str, departure_date: datetime, seat_labels: Sequence[str]
+    ) -> None:
+        pass
+
+
+class PartnerNotifierStub(PartnerNotifier):
+    """Accepts every notification silently."""
+
+    def notify_partner_about_booking(
+        self,
+        airline_code: str,
+        booking_reference: str,
+        total_price: Decimal,
+        passenger_name: str,
+        flight_details: str,
+        is_rebooking: bool = False,
+    ) -> None:
+        pass
+
+    def validate_and_notify_special_requests(
+        self, airline_code: str, special_requests: str, booking_ref: str
+    ) -> bool:
+        return True
+
+    def update_partner_booking_status(
+        self, airline_code: str, booking_ref: str, new_status: str
+    ) -> None:
+        pass
+
+
+class AuditLoggerStub(AuditLogger):
+    """Discards every log entry."""
+
+    def log_booking_activity(self, activity: str, booking_reference: str, user_info: str) -> None:
+        pass
+
+    def record_pricing_calculation(
+        self, calculation_details: str, final_price: Decimal, flight_info: str
+    ) -> None:
+        pass
+
+    def record_pricing_breakdown(self, record: PricingAuditRecord) -> None:
+        pass
+
+    def log_error_with_alert(self, ex: Exception, context: str, booking_ref: str) -> None:
+        pass
+
+    def flush_and_archive_logs(self) -> None:
+        pass
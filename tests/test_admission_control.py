@@ -0,0 +1,171 @@
+"""Tests for admission control in front of the booking coordinator."""
+
+from datetime import datetime
+from typing import Optional
+
+import pytest
+from global_object_factory import context, set_always
+
+from legacy_booking.admission_control import (
+    AdmissionControlledCoordinator,
+    AdmissionController,
+    BookingPriority,
+)
+from legacy_booking.audit_logger_impl import AuditLoggerImpl
+from legacy_booking.booking import Booking, BookingChanges
+from legacy_booking.booking_coordinator_impl import BookingCoordinatorImpl
+from legacy_booking.booking_rejected_exception import BookingRejectedException
+from legacy_booking.booking_repository_impl import BookingRepositoryImpl
+from legacy_booking.flight_availability_service_impl import FlightAvailabilityServiceImpl
+from legacy_booking.partner_notifier_impl import PartnerNotifierImpl
+
+from .fakes import (
+    AuditLoggerStub,
+    BookingRepositoryStub,
+    FlightAvailabilityServiceStub,
+    PartnerNotifierStub,
+)
+
+
+class CountingRepository(BookingRepositoryStub):
+    """Counts booking record loads."""
+
+    def __init__(self, reference: str) -> None:
+        super().__init__(reference)
+        self.loads = 0
+
+    def get_booking_record(self, booking_reference: str) -> Optional[Booking]:
+        self.loads += 1
+        return super().get_booking_record(booking_reference)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestAdmissionControl:
+    """Test class for AdmissionController."""
+
+    def test_rate_limit_applies_per_airline(self) -> None:
+        """Test that one airline exhausting its bucket does not affect another."""
+        clock = FakeClock()
+        controller = AdmissionController(airline_rate=10.0, airline_burst=2.0, clock=clock)
+
+        controller.admit("XX", []).release()
+        controller.admit("XX", []).release()
+        with pytest.raises(BookingRejectedException) as rejected:
+            controller.admit("XX", [])
+        controller.admit("AA", []).release()
+
+        assert rejected.value.reason == "rate limited"
+        assert rejected.value.retry_after == pytest.approx(0.1)
+        assert controller.metrics.shed_by_airline == {"XX": 1}
+
+    def test_zero_rate_airline_is_suspended(self) -> None:
+        """Test that a rate of zero rejects standard bookings with a fixed hint instead of crashing."""
+        controller = AdmissionController(
+            airline_rates={"XX": 0.0}, suspended_retry_after=30.0, clock=FakeClock()
+        )
+
+        with pytest.raises(BookingRejectedException) as rejected:
+            controller.admit("XX", ["smtp"])
+        controller.admit("XX", ["smtp"], BookingPriority.REBOOKING).release()
+        controller.admit("AA", ["smtp"]).release()  # Lock was not left held
+
+        assert rejected.value.reason == "suspended"
+        assert rejected.value.retry_after == 30.0
+        assert controller.in_flight("smtp") == 0
+
+    def test_negative_rate_is_rejected_up_front(self) -> None:
+        """Test that a misconfigured rate fails when the controller is built."""
+        with pytest.raises(ValueError):
+            AdmissionController(airline_rates={"XX": -1.0})
+
+    def test_bucket_refills_over_time(self) -> None:
+        """Test that a rate-limited airline is admitted again after the hint elapses."""
+        clock = FakeClock()
+        controller = AdmissionController(airline_rate=10.0, airline_burst=1.0, clock=clock)
+        controller.admit("XX", []).release()
+
+        with pytest.raises(BookingRejectedException) as rejected:
+            controller.admit("XX", [])
+        clock.now += rejected.value.retry_after
+
+        controller.admit("XX", []).release()
+
+    def test_target_concurrency_is_capped_and_released(self) -> None:
+        """Test that a busy target sheds load until a slot frees up."""
+        controller = AdmissionController(target_concurrency=4, rebooking_reserve=0.5)
+        tickets = [controller.admit("XX", ["smtp.generic-airline.com"]) for _ in range(2)]
+
+        with pytest.raises(BookingRejectedException):
+            controller.admit("XX", ["smtp.generic-airline.com"])
+        assert controller.in_flight("smtp.generic-airline.com") == 2
+
+        tickets[0].release()
+        tickets[0].release()  # Releasing twice must not free a second slot
+        controller.admit("XX", ["smtp.generic-airline.com"])
+        assert controller.in_flight("smtp.generic-airline.com") == 2
+
+    def test_rebookings_use_reserved_capacity_and_skip_rate_limit(self) -> None:
+        """Test that rebookings are admitted when standard bookings are shed."""
+        controller = AdmissionController(
+            airline_rate=1.0, airline_burst=1.0, target_concurrency=2, rebooking_reserve=0.5
+        )
+        controller.admit("XX", ["db"])
+
+        with pytest.raises(BookingRejectedException):
+            controller.admit("XX", ["db"])
+        controller.admit("XX", ["db"], BookingPriority.REBOOKING)
+
+        assert controller.metrics.admitted == 2
+        assert controller.metrics.shed_rate() == pytest.approx(1 / 3)
+
+    def test_wrapper_books_through_admitted_slots(self) -> None:
+        """Test that the wrapper holds slots for the coordinator's downstream targets."""
+        with context():
+            set_always(BookingRepositoryImpl, BookingRepositoryStub("AA1230002JOH"))
+            set_always(FlightAvailabilityServiceImpl, FlightAvailabilityServiceStub())
+            set_always(PartnerNotifierImpl, PartnerNotifierStub())
+            set_always(AuditLoggerImpl, AuditLoggerStub())
+            controller = AdmissionController()
+            coordinator = AdmissionControlledCoordinator(
+                BookingCoordinatorImpl(datetime(2025, 6, 1)), controller
+            )
+
+            booking = coordinator.book_flight("John Doe", "AA123", datetime(2025, 7, 3), 2, "AA")
+
+        assert booking.booking_reference == "AA1230002JOH"
+        assert dict(controller.metrics.peak_in_flight) == {
+            "FlightAvailability_AA": 1,
+            "smtp.american.com": 1,
+        }
+        assert controller.in_flight("smtp.american.com") == 0
+
+    def test_wrapper_rebooks_with_a_single_record_load(self) -> None:
+        """Test that the wrapper hands the booking it loaded for admission to the coordinator."""
+        repository = CountingRepository("AA1230002JOH")
+        with context():
+            set_always(BookingRepositoryImpl, repository)
+            set_always(FlightAvailabilityServiceImpl, FlightAvailabilityServiceStub())
+            set_always(PartnerNotifierImpl, PartnerNotifierStub())
+            set_always(AuditLoggerImpl, AuditLoggerStub())
+            controller = AdmissionController()
+            coordinator = AdmissionControlledCoordinator(
+                BookingCoordinatorImpl(datetime(2025, 6, 1)), controller
+            )
+            booking = coordinator.book_flight("John Doe", "AA123", datetime(2025, 7, 3), 2, "AA")
+
+            rebooked = coordinator.rebook(booking.booking_reference, BookingChanges(passenger_count=3))
+            with pytest.raises(ValueError, match="Unknown booking reference"):
+                coordinator.rebook("NOPE", BookingChanges(passenger_count=1))
+
+        assert rebooked.passenger_count == 3
+        assert repository.loads == 2  # One per rebook, the unknown reference included
+        assert controller.metrics.admitted == 2
@@ -0,0 +1,171 @@
+"""Tests for the shared airline fee and tax cache."""
+
+import threading
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterator, List, Tuple
+
+import pytest
+from global_object_factory import context, set_always
+
+from legacy_booking.airline_fee_cache import AirlineFeeCache, get_shared_fee_cache
+from legacy_booking.audit_logger_impl import AuditLoggerImpl
+from legacy_booking.booking import Booking
+from legacy_booking.booking_coordinator_impl import BookingCoordinatorImpl
+from legacy_booking.booking_repository_impl import BookingRepositoryImpl
+from legacy_booking.flight_availability_service_impl import FlightAvailabilityServiceImpl
+from legacy_booking.partner_notifier_impl import PartnerNotifierImpl
+from legacy_booking.pricing_engine import PricingEngine
+
+from .fakes import (
+    AuditLoggerStub,
+    BookingRepositoryStub,
+    FlightAvailabilityServiceStub,
+    PartnerNotifierStub,
+)
+
+
+def engine(cache: AirlineFeeCache) -> PricingEngine:
+    return PricingEngine(
+        Decimal("1.18"), {}, False, "US", Decimal("500"), datetime(2025, 6, 1), cache
+    )
+
+
+class TestAirlineFeeCache:
+    """Test class for AirlineFeeCache."""
+
+    def test_engines_share_the_process_wide_cache_by_default(self) -> None:
+        """Test that a fee computed by one engine is reused by the next."""
+        first = PricingEngine(Decimal("1.18"), {}, False, "US", Decimal("500"))
+        second = PricingEngine(Decimal("1.18"), {}, False, "US", Decimal("500"))
+
+        assert first.fee_cache is second.fee_cache is get_shared_fee_cache()
+
+    def test_fee_is_computed_once_per_airline(self) -> None:
+        """Test that the legacy fee algorithm only runs on a cache miss."""
+        cache = AirlineFeeCache()
+
+        assert engine(cache).get_airline_specific_fees_and_update_cache("QF", 2) == Decimal("50.0")
+        cache.publish(fees={"QF": Decimal("40.0")})
+        assert engine(cache).get_airline_specific_fees_and_update_cache("QF", 2) == Decimal("80.0")
+
+    def test_computed_fees_are_not_published(self) -> None:
+        """Test that a computed default fee stays out of the partner fee table."""
+        cache = AirlineFeeCache()
+
+        engine(cache).get_airline_specific_fees_and_update_cache("QF", 1)
+
+        assert cache.get_fee("QF") is None
+        assert cache.snapshot().computed_fees == {"QF": Decimal("25.0")}
+
+    def test_published_changes_reach_existing_engines(self) -> None:
+        """Test that partner fee and tax changes apply without rebuilding the engine."""
+        cache = AirlineFeeCache()
+        pricing_engine = engine(cache)
+        departure = datetime(2025, 7, 3)
+        before = pricing_engine.calculate_base_price_with_taxes("QF1", departure, 1, "QF")
+
+        version = cache.publish(fees={"QF": Decimal("30")}, tax_rates={"QF": Decimal("1.20")})
+        after = pricing_engine.calculate_base_price_with_taxes("QF1", departure, 1, "QF")
+
+        assert version == 1
+        assert after > before
+
+    def test_invalidation_bumps_version_and_drops_entries(self) -> None:
+        """Test that operators can drop one airline or the whole table."""
+        cache = AirlineFeeCache()
+        cache.publish(fees={"AA": Decimal("25"), "BA": Decimal("30")})
+        old_snapshot = cache.snapshot()
+
+        cache.invalidate("AA")
+        assert cache.get_fee("AA") is None
+        assert cache.get_fee("BA") == Decimal("30")
+        assert old_snapshot.fees["AA"] == Decimal("25")  # Readers keep their version
+
+        assert cache.invalidate() == old_snapshot.version + 2
+        assert len(cache) == 0
+
+    def test_number_of_airlines_is_bounded(self) -> None:
+        """Test that the least recently written airlines are evicted."""
+        cache = AirlineFeeCache(max_airlines=3)
+        for airline_code in ("AA", "BA", "UA", "QF"):
+            cache.publish(fees={airline_code: Decimal("10")})
+
+        assert len(cache) == 3
+        assert cache.get_fee("AA") is None
+        assert cache.get_fee("QF") == Decimal("10")
+
+    def test_readers_always_see_a_complete_version(self) -> None:
+        """Test that concurrent readers never observe a half-applied publish."""
+        cache = AirlineFeeCache()
+        cache.publish(fees={"AA": Decimal("0"), "BA": Decimal("0")})
+        torn: List[Tuple[Decimal, Decimal]] = []
+        done = threading.Event()
+
+        def read() -> None:
+            while not done.is_set():
+                snapshot = cache.snapshot()
+                if snapshot.fees["AA"] != snapshot.fees["BA"]:
+                    torn.append((snapshot.fees["AA"], snapshot.fees["BA"]))
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for value in range(2000):
+            cache.publish(fees={"AA": Decimal(value), "BA": Decimal(value)})
+        done.set()
+        for reader in readers:
+            reader.join()
+
+        assert torn == []
+
+
+class TestPublishedFeesInBookings:
+    """Test class for partner-published fees and taxes in BookingCoordinatorImpl.book_flight."""
+
+    @pytest.fixture(autouse=True)
+    def services(self) -> Iterator[None]:
+        with context():
+            set_always(BookingRepositoryImpl, BookingRepositoryStub("AA1230002JOH"))
+            set_always(FlightAvailabilityServiceImpl, FlightAvailabilityServiceStub())
+            set_always(PartnerNotifierImpl, PartnerNotifierStub())
+            set_always(AuditLoggerImpl, AuditLoggerStub())
+            yield
+
+    def book(self, cache: AirlineFeeCache, failure: bool = False) -> Booking:
+        coordinator = BookingCoordinatorImpl(datetime(2025, 6, 1), fee_cache=cache)
+        if failure:
+            coordinator.state.last_failure_reason = "Not enough seats"
+        return coordinator.book_flight("John Smith", "AA123", datetime(2025, 7, 3), 2, "AA")
+
+    def test_published_fee_is_added_to_the_coordinator_fee(self) -> None:
+        """Test that a partner fee raises the price on top of the per-booking fee."""
+        without = self.book(AirlineFeeCache())
+        cache = AirlineFeeCache()
+        cache.publish(fees={"AA": Decimal("20.0")})
+
+        with_fee = self.book(cache)
+
+        # 20.0 per passenger, plus the 50% historical adjustment, times the 2 x 0.95 group multiplier
+        assert with_fee.pricing.base_price - without.pricing.base_price == Decimal("114.0")
+
+    def test_failure_surcharge_applies_on_top_of_published_tax_rate(self) -> None:
+        """Test that a published tax rate replaces 1.18 but keeps the +0.05 surcharge."""
+        cache = AirlineFeeCache()
+        cache.publish(tax_rates={"AA": Decimal("1.30")})
+
+        calm = self.book(cache)
+        after_failure = self.book(cache, failure=True)
+
+        # 299.99 x 0.05, plus the 50% historical adjustment, times the 2 x 0.95 group multiplier
+        assert after_failure.pricing.base_price - calm.pricing.base_price == Decimal("42.748575")
+
+    def test_fee_lookup_does_not_change_later_prices(self) -> None:
+        """Test that computing the legacy fee for an airline leaves its quotes alone."""
+        cache = AirlineFeeCache()
+        before = self.book(cache)
+
+        engine(cache).get_airline_specific_fees_and_update_cache("AA", 2)
+        after = self.book(cache)
+
+        assert after.pricing.base_price == before.pricing.base_price
@@ -0,0 +1,147 @@
+"""Tests for binary audit records and the memory-mapped segment reader."""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from legacy_booking.audit_log_reader import AuditArchiveReader, AuditLogReader
+from legacy_booking.audit_record import AuditSegmentWriter, PricingAuditRecord
+
+
+def make_record(reference: str, flight_number: str, booked_at: datetime) -> PricingAuditRecord:
+    return PricingAuditRecord(
+        booking_reference=reference,
+        flight_number=flight_number,
+        booking_date=booked_at,
+        departure_date=datetime(2025, 7, 3),
+        base_price=Decimal("812.3456"),
+        weekday_multiplier=Decimal("1.25"),
+        seasonal_bonus=Decimal("50.0"),
+        special_request_surcharge=Decimal("35.0"),
+        discount_amount=Decimal("10.0"),
+        final_price=Decimal("1090.43"),
+    )
+
+
+def write_segment(path: Path, first: int, count: int) -> str:
+    writer = AuditSegmentWriter()
+    start = datetime(2025, 6, 1)
+    for i in range(first, first + count):
+        flight_number = ["AA123", "BA456", "UA789"][i % 3]
+        writer.append(make_record(f"{flight_number}{i:04d}JOH", flight_number, start + timedelta(hours=i)))
+
+    with open(path, "wb") as stream:
+        writer.write_to(stream)
+    return str(path)
+
+
+@pytest.fixture
+def segment(tmp_path: Path) -> str:
+    return write_segment(tmp_path / "audit-0001.seg", 0, 300)
+
+
+class TestAuditLogReader:
+    """Test class for AuditSegmentWriter and AuditLogReader."""
+
+    def test_records_round_trip_in_cents(self, segment: str) -> None:
+        """Test that records come back with amounts rounded to cents."""
+        with AuditLogReader(segment) as reader:
+            record = next(reader.records(booking_reference="AA1230000JOH"))
+
+        assert len(reader) == 300
+        assert record.base_price == Decimal("812.35")
+        assert record.weekday_multiplier == Decimal("1.25")
+        assert record.final_price == Decimal("1090.43")
+        assert record.booking_date == datetime(2025, 6, 1)
+
+    def test_filters_by_flight_and_time_range(self, segment: str) -> None:
+        """Test that flight and booking time filters combine."""
+        with AuditLogReader(segment) as reader:
+            matches = list(
+                reader.records(
+                    flight_number="BA456",
+                    start=datetime(2025, 6, 2),
+                    end=datetime(2025, 6, 3),
+                )
+            )
+
+        assert [record.booking_reference for record in matches] == [
+            f"BA456{i:04d}JOH" for i in range(25, 48, 3)
+        ]
+
+    def test_unknown_reference_matches_nothing(self, segment: str) -> None:
+        """Test that a reference missing from the string table yields no records."""
+        with AuditLogReader(segment) as reader:
+            assert list(reader.records(booking_reference="NOPE")) == []
+
+    def test_render_matches_legacy_text(self) -> None:
+        """Test that lazily rendered text matches the old eager format."""
+        record = make_record("AA1230000JOH", "AA123", datetime(2025, 6, 1))
+
+        assert record.calculation_details() == (
+            "Base: 812.3456, Weekday: 1.25, Seasonal: 50.0, Special: 35.0, Discount: 10.0"
+        )
+        assert record.flight_info() == "AA123 on 2025-07-03"
+
+    def test_rejects_files_that_are_not_segments(self, tmp_path: Path) -> None:
+        """Test that arbitrary files are refused."""
+        path = tmp_path / "notes.txt"
+        path.write_bytes(b"just some text, definitely not audit data")
+
+        with pytest.raises(ValueError):
+            AuditLogReader(str(path))
+
+    def test_truncated_segment_raises_value_error(self, segment: str, tmp_path: Path) -> None:
+        """Test that a segment cut off mid-way is refused instead of read past its end."""
+        data = Path(segment).read_bytes()
+        for size in (40, len(data) // 2):
+            path = tmp_path / f"truncated-{size}.seg"
+            path.write_bytes(data[:size])
+
+            with pytest.raises(ValueError, match="truncated"):
+                AuditLogReader(str(path))
+
+        path = tmp_path / "truncated-strings.seg"
+        path.write_bytes(data[:-3])
+        with AuditLogReader(str(path)) as reader:  # Strings are only read on demand
+            with pytest.raises(ValueError, match="Truncated"):
+                list(reader.records(booking_reference="AA1230000JOH"))
+
+    def test_time_range_is_decided_before_reading_strings(self, segment: str, tmp_path: Path) -> None:
+        """Test that a segment outside the time range is skipped without touching its string table."""
+        path = tmp_path / "truncated-strings.seg"
+        path.write_bytes(Path(segment).read_bytes()[:-3])
+
+        with AuditLogReader(str(path)) as reader:
+            assert list(reader.records(booking_reference="AA1230000JOH", start=datetime(2026, 1, 1))) == []
+
+
+class TestAuditArchiveReader:
+    """Test class for filtering across several segments."""
+
+    def test_filters_across_segments_in_order(self, tmp_path: Path) -> None:
+        """Test that matches from every segment come back oldest first."""
+        for number, first in enumerate(range(0, 300, 100)):
+            write_segment(tmp_path / f"audit-{number:04d}.seg", first, 100)
+        (tmp_path / "notes.txt").write_text("not a segment")
+
+        archive = AuditArchiveReader.from_directory(str(tmp_path))
+        matches = list(archive.records(flight_number="UA789", start=datetime(2025, 6, 5)))
+
+        assert len(archive.segment_paths) == 3
+        assert [record.booking_reference for record in matches] == [
+            f"UA789{i:04d}JOH" for i in range(98, 300, 3)
+        ]
+
+    def test_skips_segments_outside_the_time_range(self, tmp_path: Path) -> None:
+        """Test that segments whose header range misses the filter are not scanned."""
+        old = write_segment(tmp_path / "audit-0000.seg", 0, 100)
+        recent = write_segment(tmp_path / "audit-0001.seg", 100, 100)
+
+        with AuditLogReader(old) as reader:
+            assert not reader.overlaps(datetime(2025, 6, 6), None)
+        with AuditLogReader(recent) as reader:
+            assert reader.overlaps(datetime(2025, 6, 6), None)
+            assert reader.first_booking_date == datetime(2025, 6, 5, 4)
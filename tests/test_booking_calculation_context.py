@@ -0,0 +1,106 @@
+"""Tests for the per-booking calculation context and its pool."""
+
+import gc
+import os
+import sys
+import tracemalloc
+from datetime import datetime
+from typing import Tuple
+
+from global_object_factory import context, set_always
+
+from legacy_booking.audit_logger_impl import AuditLoggerImpl
+from legacy_booking.booking_calculation_context import (
+    BookingCalculationContext,
+    BookingCalculationContextPool,
+)
+from legacy_booking.booking_coordinator_impl import BookingCoordinatorImpl
+from legacy_booking.booking_repository_impl import BookingRepositoryImpl
+from legacy_booking.flight_availability_service_impl import FlightAvailabilityServiceImpl
+from legacy_booking.partner_notifier_impl import PartnerNotifierImpl
+
+from .fakes import (
+    AuditLoggerStub,
+    BookingRepositoryStub,
+    FlightAvailabilityServiceStub,
+    PartnerNotifierStub,
+)
+
+# Set LONG_RUN_BOOKINGS=1000000 for the full soak run.
+LONG_RUN_BOOKINGS = int(os.environ.get("LONG_RUN_BOOKINGS", "10000"))
+
+
+class TestBookingCalculationContext:
+    """Test class for BookingCalculationContext and its pool."""
+
+    def test_context_has_fixed_layout(self) -> None:
+        """Test that contexts reject attributes outside their slots."""
+        calculation_context = BookingCalculationContext()
+
+        assert not hasattr(calculation_context, "__dict__")
+
+    def test_released_context_is_reset_and_reused(self) -> None:
+        """Test that the pool hands back the same, cleared context."""
+        pool = BookingCalculationContextPool()
+        first = pool.acquire()
+        first.departure_date = datetime(2025, 7, 3)
+        first.is_peak_day = True
+
+        pool.release(first)
+        second = pool.acquire()
+
+        assert second is first
+        assert second.departure_date is None
+        assert second.is_peak_day is False
+
+    def test_pool_keeps_at_most_max_size_contexts(self) -> None:
+        """Test that the free list is bounded."""
+        pool = BookingCalculationContextPool(max_size=2)
+
+        for calculation_context in [pool.acquire() for _ in range(5)]:
+            pool.release(calculation_context)
+
+        assert len(pool) == 2
+
+    def test_memory_per_booking_stays_flat_over_long_run(self) -> None:
+        """Test that memory and allocations per booking stay flat on one coordinator."""
+        with context():
+            set_always(BookingRepositoryImpl, BookingRepositoryStub())
+            set_always(FlightAvailabilityServiceImpl, FlightAvailabilityServiceStub())
+            set_always(PartnerNotifierImpl, PartnerNotifierStub())
+            set_always(AuditLoggerImpl, AuditLoggerStub())
+
+            coordinator = BookingCoordinatorImpl(datetime(2025, 6, 1))
+
+            def book(count: int) -> None:
+                for i in range(count):
+                    coordinator.book_flight(
+                        "John Doe", "AA123", datetime(2025, 7, 3 + i % 20), 2, "AA", "meal"
+                    )
+
+            def measure(count: int) -> Tuple[int, int, int]:
+                """Return net bytes, net allocated blocks and transient peak bytes."""
+                gc.collect()
+                tracemalloc.start()  # Restarting also resets the peak
+                try:
+                    blocks_before = sys.getallocatedblocks()
+                    bytes_before, _ = tracemalloc.get_traced_memory()
+                    book(count)
+                    gc.collect()
+                    bytes_after, peak = tracemalloc.get_traced_memory()
+                    blocks_after = sys.getallocatedblocks()
+                finally:
+                    tracemalloc.stop()
+                return bytes_after - bytes_before, blocks_after - blocks_before, peak - bytes_before
+
+            book(1000)  # Warm up caches and the context pool
+            first_bytes, first_blocks, first_peak = measure(LONG_RUN_BOOKINGS // 2)
+            second_bytes, second_blocks, second_peak = measure(LONG_RUN_BOOKINGS // 2)
+
+            # Nothing is retained per booking...
+            assert second_bytes < 4096
+            assert second_blocks < 64
+            assert second_blocks <= max(first_blocks, 0) + 64
+            # ...and the temporary allocations of a booking do not grow either
+            assert second_peak <= first_peak * 1.1 + 4096
+            assert len(coordinator._context_pool) == 1
@@ -0,0 +1,124 @@
+"""Tests for checkpointed coordinator state and warm restarts."""
+
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Iterator, Set
+
+import pytest
+from global_object_factory import context, set_always
+
+from legacy_booking.audit_logger_impl import AuditLoggerImpl
+from legacy_booking.booking_coordinator_impl import BookingCoordinatorImpl
+from legacy_booking.booking_repository_impl import BookingRepositoryImpl
+from legacy_booking.coordinator_checkpoint import CoordinatorCheckpoint
+from legacy_booking.flight_availability_service_impl import FlightAvailabilityServiceImpl
+from legacy_booking.partner_notifier_impl import PartnerNotifierImpl
+
+from .fakes import (
+    AuditLoggerStub,
+    BookingRepositoryStub,
+    FlightAvailabilityServiceStub,
+    PartnerNotifierStub,
+)
+
+
+class FailingStatusNotifier(PartnerNotifierStub):
+    """Fails every booking after it has been saved."""
+
+    def update_partner_booking_status(
+        self, airline_code: str, booking_ref: str, new_status: str
+    ) -> None:
+        raise RuntimeError("partner status endpoint down")
+
+
+def book(coordinator: BookingCoordinatorImpl, count: int) -> None:
+    for _ in range(count):
+        coordinator.book_flight("John Doe", "AA123", datetime(2025, 7, 3), 2, "AA")
+
+
+class TestCoordinatorCheckpoint:
+    """Test class for CoordinatorCheckpoint."""
+
+    @pytest.fixture(autouse=True)
+    def services(self, tmp_path: Path) -> Iterator[None]:
+        self.journal = str(tmp_path / "coordinator.journal")
+        with context():
+            set_always(BookingRepositoryImpl, BookingRepositoryStub())
+            set_always(FlightAvailabilityServiceImpl, FlightAvailabilityServiceStub())
+            set_always(PartnerNotifierImpl, PartnerNotifierStub())
+            set_always(AuditLoggerImpl, AuditLoggerStub())
+            yield
+
+    def test_fresh_start_without_journal(self) -> None:
+        """Test that a missing journal starts the coordinator from scratch."""
+        coordinator = BookingCoordinatorImpl(checkpoint=CoordinatorCheckpoint(self.journal))
+
+        assert coordinator.booking_counter == 1
+        assert coordinator.state.last_booking_price is None
+
+    def test_clean_shutdown_restores_exact_state(self) -> None:
+        """Test that a saved checkpoint brings back the counter and carried-over state."""
+        first = BookingCoordinatorImpl(checkpoint=CoordinatorCheckpoint(self.journal))
+        book(first, 7)
+        first.state.debug_mode = True
+        first.save_checkpoint()
+
+        second = BookingCoordinatorImpl(checkpoint=CoordinatorCheckpoint(self.journal))
+
+        assert second.booking_counter == first.booking_counter == 8
+        assert second.last_booking_ref == first.last_booking_ref
+        assert second.state.last_booking_price == first.state.last_booking_price
+        assert isinstance(second.state.last_booking_price, Decimal)
+        assert second.state.last_booking_date == first.state.last_booking_date
+        assert second.state.debug_mode is True
+
+    def test_crash_never_reuses_booking_numbers(self) -> None:
+        """Test that a restart without a clean shutdown resumes past every used number."""
+        first = BookingCoordinatorImpl(checkpoint=CoordinatorCheckpoint(self.journal, interval=10))
+        book(first, 13)  # No save_checkpoint: simulates a crash
+
+        second = BookingCoordinatorImpl(checkpoint=CoordinatorCheckpoint(self.journal, interval=10))
+
+        assert first.booking_counter < second.booking_counter <= first.booking_counter + 10
+
+    def test_bookings_failing_after_save_still_lease_their_numbers(self) -> None:
+        """Test that a booking saved and then failed cannot have its reference reused after a crash."""
+        first = BookingCoordinatorImpl(checkpoint=CoordinatorCheckpoint(self.journal, interval=3))
+        book(first, 4)
+        used: Set[str] = set()
+        set_always(PartnerNotifierImpl, FailingStatusNotifier())
+        for _ in range(4):  # Runs past the lease written at the fifth booking
+            with pytest.raises(RuntimeError):
+                book(first, 1)
+            used.add(first.last_booking_ref)  # Saved before the notifier failed
+
+        set_always(PartnerNotifierImpl, PartnerNotifierStub())
+        second = BookingCoordinatorImpl(checkpoint=CoordinatorCheckpoint(self.journal, interval=3))
+        book(second, 1)
+
+        assert second.last_booking_ref not in used
+        assert second.booking_counter > first.booking_counter
+
+    def test_torn_last_line_is_ignored(self) -> None:
+        """Test that a partially written snapshot falls back to the previous one."""
+        first = BookingCoordinatorImpl(checkpoint=CoordinatorCheckpoint(self.journal))
+        book(first, 3)
+        first.save_checkpoint()
+        with open(self.journal, "a", encoding="utf-8") as journal:
+            journal.write('{"version":1,"counter":99')
+
+        second = BookingCoordinatorImpl(checkpoint=CoordinatorCheckpoint(self.journal))
+
+        assert second.booking_counter == 4
+
+    def test_journal_is_compacted(self) -> None:
+        """Test that the journal shrinks back to a single snapshot."""
+        checkpoint = CoordinatorCheckpoint(self.journal, interval=1, compact_after=5)
+        coordinator = BookingCoordinatorImpl(checkpoint=checkpoint)
+        book(coordinator, 12)
+        coordinator.save_checkpoint()
+
+        with open(self.journal, encoding="utf-8") as journal:
+            assert len(journal.readlines()) < 5
+        assert BookingCoordinatorImpl(checkpoint=CoordinatorCheckpoint(self.journal)).booking_counter == 13
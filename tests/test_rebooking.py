@@ -0,0 +1,307 @@
+"""Tests for incremental rebooking."""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import pytest
+from global_object_factory import context, set_always
+
+from legacy_booking.audit_logger_impl import AuditLoggerImpl
+from legacy_booking.booking import Booking, BookingChanges
+from legacy_booking.booking_coordinator_impl import BookingCoordinatorImpl
+from legacy_booking.booking_repository_impl import BookingRepositoryImpl
+from legacy_booking.flight_availability_service_impl import FlightAvailabilityServiceImpl
+from legacy_booking.partner_notifier_impl import PartnerNotifierImpl
+from legacy_booking.seat_map import SeatMap
+
+from .fakes import (
+    AuditLoggerStub,
+    BookingRepositoryStub,
+    FlightAvailabilityServiceStub,
+    PartnerNotifierStub,
+)
+
+
+class RecordingRepository(BookingRepositoryStub):
+    """Records inserts and every stored booking record."""
+
+    def __init__(self) -> None:
+        super().__init__("BA4560002JAN")
+        self.saved = 0
+        self.writes: List[Booking] = []
+
+    def save_booking_details(
+        self, passenger_name: str, flight_details: str, price: Decimal, booking_date: datetime
+    ) -> str:
+        self.saved += 1
+        return self.reference
+
+    def save_booking_record(self, booking: Booking) -> None:
+        self.writes.append(booking)
+        super().save_booking_record(booking)
+
+
+class CountingAvailabilityService(FlightAvailabilityServiceStub):
+    """Counts availability queries."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.queries = 0
+
+    def check_and_get_available_seats_for_booking(
+        self, flight_number: str, departure_date: datetime, passenger_count: int
+    ) -> List[str]:
+        self.queries += 1
+        return self.seats
+
+
+class RecordingNotifier(PartnerNotifierStub):
+    """Records the rebooking flag of every partner notification."""
+
+    def __init__(self) -> None:
+        self.rebooking_flags: List[bool] = []
+        self.special_requests: List[str] = []
+
+    def notify_partner_about_booking(
+        self,
+        airline_code: str,
+        booking_reference: str,
+        total_price: Decimal,
+        passenger_name: str,
+        flight_details: str,
+        is_rebooking: bool = False,
+    ) -> None:
+        self.rebooking_flags.append(is_rebooking)
+
+    def validate_and_notify_special_requests(
+        self, airline_code: str, special_requests: str, booking_ref: str
+    ) -> bool:
+        self.special_requests.append(special_requests)
+        return True
+
+
+class StatusEndpointDownNotifier(PartnerNotifierStub):
+    """Fails every booking after the partner status update is attempted."""
+
+    def update_partner_booking_status(
+        self, airline_code: str, booking_ref: str, new_status: str
+    ) -> None:
+        raise RuntimeError("partner status endpoint down")
+
+
+class SeatMapAvailabilityService(FlightAvailabilityServiceStub):
+    """Keeps one three-seat-per-row map per departure date and holds seats on it."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.seat_maps: Dict[datetime, SeatMap] = {}
+
+    def get_seat_map(self, flight_number: str, departure_date: datetime) -> Optional[SeatMap]:
+        if departure_date not in self.seat_maps:
+            seat_map = SeatMap("ABC")
+            for row in (1, 2):
+                seat_map.add_row(row, free=True)
+            self.seat_maps[departure_date] = seat_map
+        return self.seat_maps[departure_date]
+
+    def reserve_seats(
+        self, flight_number: str, departure_date: datetime, seat_labels: Sequence[str]
+    ) -> bool:
+        seat_map = self.get_seat_map(flight_number, departure_date)
+        if not all(seat_map.is_free(label) for label in seat_labels):
+            return False
+        for label in seat_labels:
+            seat_map.mark_occupied(label)
+        return True
+
+    def release_seats(
+        self, flight_number: str, departure_date: datetime, seat_labels: Sequence[str]
+    ) -> None:
+        seat_map = self.get_seat_map(flight_number, departure_date)
+        for label in seat_labels:
+            seat_map.mark_free(label)
+
+
+class TestRebooking:
+    """Test class for BookingCoordinatorImpl.rebook."""
+
+    @pytest.fixture(autouse=True)
+    def services(self) -> Iterator[None]:
+        self.repository = RecordingRepository()
+        self.availability = CountingAvailabilityService()
+        self.notifier = RecordingNotifier()
+        with context():
+            set_always(BookingRepositoryImpl, self.repository)
+            set_always(FlightAvailabilityServiceImpl, self.availability)
+            set_always(PartnerNotifierImpl, self.notifier)
+            set_always(AuditLoggerImpl, AuditLoggerStub())
+            self.coordinator = BookingCoordinatorImpl(datetime(2025, 6, 1))
+            self.original = self.coordinator.book_flight(
+                "Jane Roe", "BA456", datetime(2025, 7, 3), 2, "BA", "meal"
+            )
+            yield
+
+    def test_special_request_change_skips_availability_and_updates_in_place(self) -> None:
+        """Test that changing only special requests reprices just the surcharge."""
+        rebooked = self.coordinator.rebook(
+            self.original.booking_reference, BookingChanges(special_requests="meal,seat")
+        )
+
+        assert self.availability.queries == 1
+        assert self.repository.saved == 1
+        assert rebooked.booking_reference == self.original.booking_reference
+        assert rebooked.pricing.special_request_surcharge == Decimal("50.0")
+        assert rebooked.pricing.base_price == self.original.pricing.base_price
+        assert rebooked.final_price == self.original.final_price + Decimal("35.0")
+        assert self.repository.writes == [self.original, rebooked]  # A single write per rebooking
+        assert self.notifier.rebooking_flags == []  # BA is not notified below five bookings
+
+    def test_date_change_requeries_availability_and_reprices_date_components(self) -> None:
+        """Test that moving the date recomputes weekday and seasonal components only."""
+        rebooked = self.coordinator.rebook(
+            self.original.booking_reference, BookingChanges(departure_date=datetime(2025, 12, 12))
+        )
+
+        assert self.availability.queries == 2
+        assert rebooked.pricing.weekday_multiplier == Decimal("1.25")  # Friday
+        assert rebooked.pricing.seasonal_bonus == self.original.pricing.seasonal_bonus + Decimal("25.0")
+        assert rebooked.pricing.special_request_surcharge == self.original.pricing.special_request_surcharge
+        assert rebooked.pricing.discount_amount == self.original.pricing.discount_amount
+        assert self.repository.writes[-1].departure_date == datetime(2025, 12, 12)
+
+    def test_passenger_count_change_reprices_base_and_reseats(self) -> None:
+        """Test that a larger party gets new seats and a new base price."""
+        rebooked = self.coordinator.rebook(
+            self.original.booking_reference, BookingChanges(passenger_count=4)
+        )
+
+        assert self.availability.queries == 2
+        assert len(rebooked.seat_assignments) == 4
+        assert rebooked.pricing.base_price > self.original.pricing.base_price
+        assert rebooked.pricing.weekday_multiplier == self.original.pricing.weekday_multiplier
+
+    def test_rebooking_loads_the_breakdown_from_the_repository(self) -> None:
+        """Test that a coordinator that did not make the booking can still rebook it."""
+        restarted = BookingCoordinatorImpl(datetime(2025, 6, 1))
+
+        rebooked = restarted.rebook(
+            self.original.booking_reference, BookingChanges(passenger_name="Jane Doe")
+        )
+
+        assert self.repository.records[rebooked.booking_reference] == rebooked
+        assert rebooked.pricing == self.original.pricing
+        assert rebooked.passenger_name == "Jane Doe"
+        assert self.availability.queries == 1
+
+    def test_unknown_reference_is_rejected(self) -> None:
+        """Test that only bookings known to the coordinator can be rebooked."""
+        with pytest.raises(ValueError):
+            self.coordinator.rebook("NOPE", BookingChanges(passenger_count=1))
+
+
+class TestRebookingSideEffects:
+    """Test class for partner notifications and seats on rebooking."""
+
+    @pytest.fixture(autouse=True)
+    def services(self) -> Iterator[None]:
+        self.repository = RecordingRepository()
+        self.availability = SeatMapAvailabilityService()
+        self.notifier = RecordingNotifier()
+        with context():
+            set_always(BookingRepositoryImpl, self.repository)
+            set_always(FlightAvailabilityServiceImpl, self.availability)
+            set_always(PartnerNotifierImpl, self.notifier)
+            set_always(AuditLoggerImpl, AuditLoggerStub())
+            self.coordinator = BookingCoordinatorImpl(datetime(2025, 6, 1))
+            self.original = self.coordinator.book_flight(
+                "Jane Roe", "AA123", datetime(2025, 7, 3), 2, "AA"
+            )
+            yield
+
+    def test_changed_special_requests_are_sent_to_the_partner(self) -> None:
+        """Test that rebooking notifies like book_flight, including special requests."""
+        self.coordinator.rebook(
+            self.original.booking_reference, BookingChanges(special_requests="wheelchair")
+        )
+        self.coordinator.rebook(
+            self.original.booking_reference, BookingChanges(passenger_name="Jane Doe")
+        )
+
+        assert self.notifier.rebooking_flags == [False, True, True]
+        assert self.notifier.special_requests == ["wheelchair"]
+
+    def test_larger_party_gets_its_own_seats_back(self) -> None:
+        """Test that reseating on the same date releases the original seats first."""
+        rebooked = self.coordinator.rebook(
+            self.original.booking_reference, BookingChanges(passenger_count=3)
+        )
+
+        seat_map = self.availability.seat_maps[datetime(2025, 7, 3)]
+        assert self.original.seat_assignments == ["1A", "1B"]
+        assert rebooked.seat_assignments == ["1A", "1B", "1C"]
+        assert seat_map.free_count() == 3
+
+    def test_date_change_frees_the_seats_on_the_old_departure(self) -> None:
+        """Test that moving to another date gives the old seats back."""
+        self.coordinator.rebook(
+            self.original.booking_reference, BookingChanges(departure_date=datetime(2025, 7, 4))
+        )
+
+        assert self.availability.seat_maps[datetime(2025, 7, 3)].free_count() == 6
+        assert self.availability.seat_maps[datetime(2025, 7, 4)].free_count() == 4
+
+    def test_failed_reseat_keeps_the_original_seats(self) -> None:
+        """Test that the original seats stay taken when the larger party does not fit."""
+        with pytest.raises(ValueError):
+            self.coordinator.rebook(self.original.booking_reference, BookingChanges(passenger_count=7))
+
+        seat_map = self.availability.seat_maps[datetime(2025, 7, 3)]
+        assert not seat_map.is_free("1A") and not seat_map.is_free("1B")
+        assert seat_map.free_count() == 4
+
+    def test_failed_rebooking_gives_back_only_the_new_seats(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a reseat failing to be stored frees new seats and keeps the old ones."""
+
+        def unavailable(*args: object) -> None:
+            raise ConnectionError("Booking database unavailable")
+
+        monkeypatch.setattr(self.repository, "save_booking_record", unavailable)
+
+        with pytest.raises(ConnectionError):
+            self.coordinator.rebook(self.original.booking_reference, BookingChanges(passenger_count=3))
+
+        seat_map = self.availability.seat_maps[datetime(2025, 7, 3)]
+        assert not seat_map.is_free("1A") and not seat_map.is_free("1B")
+        assert seat_map.free_count() == 4
+
+    def test_booking_failing_in_notification_is_stored_and_rebookable(self) -> None:
+        """Test that the record is written before partners are told about the booking."""
+        self.repository.records.clear()  # The stub hands out the same reference every time
+        set_always(PartnerNotifierImpl, StatusEndpointDownNotifier())
+        with pytest.raises(RuntimeError):
+            self.coordinator.book_flight("John Doe", "AA123", datetime(2025, 7, 3), 2, "AA")
+
+        stored = self.coordinator.find_booking(self.repository.reference)
+        seat_map = self.availability.seat_maps[datetime(2025, 7, 3)]
+        assert stored is not None and stored.passenger_name == "John Doe"
+        assert all(not seat_map.is_free(label) for label in stored.seat_assignments)
+
+        set_always(PartnerNotifierImpl, self.notifier)
+        rebooked = self.coordinator.rebook(stored.booking_reference, BookingChanges(passenger_count=1))
+        assert len(rebooked.seat_assignments) == 1
+        assert seat_map.free_count() == 6 - 2 - 1
+
+    def test_rebooking_failing_in_notification_leaves_a_consistent_record(self) -> None:
+        """Test that the stored booking matches the held seats when a partner call fails."""
+        set_always(PartnerNotifierImpl, StatusEndpointDownNotifier())
+        with pytest.raises(RuntimeError):
+            self.coordinator.rebook(self.original.booking_reference, BookingChanges(passenger_count=3))
+
+        stored = self.repository.records[self.original.booking_reference]
+        seat_map = self.availability.seat_maps[datetime(2025, 7, 3)]
+        assert stored.passenger_count == 3
+        assert all(not seat_map.is_free(label) for label in stored.seat_assignments)
+        assert seat_map.free_count() == 6 - len(stored.seat_assignments)
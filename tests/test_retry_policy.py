@@ -0,0 +1,188 @@
+"""Tests for retry policies, the retry budget and the retrier."""
+
+import random
+from datetime import datetime
+from decimal import Decimal
+from typing import Callable, List
+
+import pytest
+from global_object_factory import context, create, set_always
+
+from legacy_booking.audit_logger_impl import AuditLoggerImpl
+from legacy_booking import booking_coordinator_impl
+from legacy_booking.booking_coordinator_impl import BookingCoordinatorImpl
+from legacy_booking.booking_repository_impl import BookingRepositoryImpl
+from legacy_booking.flight_availability_service_impl import FlightAvailabilityServiceImpl
+from legacy_booking.partner_notifier_impl import PartnerNotifierImpl
+from legacy_booking.can_not_use_in_tests_exception import CanNotUseInTestsException
+from legacy_booking.retry_policy import (
+    BookingCountRetryPolicy,
+    ExponentialBackoffRetryPolicy,
+    FixedRetryPolicy,
+    Retrier,
+    RetryBudget,
+    RetryMetrics,
+    get_shared_retry_budget,
+    get_shared_retry_metrics,
+)
+
+from .fakes import (
+    AuditLoggerStub,
+    BookingRepositoryStub,
+    FlightAvailabilityServiceStub,
+    PartnerNotifierStub,
+)
+
+
+class FlakyOperation:
+    """Fails with the given error a number of times, then succeeds."""
+
+    def __init__(self, failures: int, error: Exception) -> None:
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def __call__(self, value: str) -> str:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return value
+
+
+class TimingOutNotifier(PartnerNotifierStub):
+    """Times out on every booking notification."""
+
+    def __init__(self) -> None:
+        self.notifications = 0
+
+    def notify_partner_about_booking(
+        self,
+        airline_code: str,
+        booking_reference: str,
+        total_price: Decimal,
+        passenger_name: str,
+        flight_details: str,
+        is_rebooking: bool = False,
+    ) -> None:
+        self.notifications += 1
+        raise TimeoutError("smtp timeout")
+
+
+class TestRetryPolicy:
+    """Test class for the retry subsystem."""
+
+    def test_booking_count_policy_matches_legacy_calculation(self) -> None:
+        """Test that the legacy policy still grows with the booking counter."""
+        policy = BookingCountRetryPolicy()
+
+        assert [policy.max_retries(n) for n in (1, 10, 25, 100)] == [1, 2, 3, 5]
+
+    def test_exponential_backoff_doubles_and_caps(self) -> None:
+        """Test that delays double per retry without exceeding the maximum."""
+        policy = ExponentialBackoffRetryPolicy(base_delay=0.1, max_delay=0.5, jitter=False)
+
+        assert [policy.backoff_delay(n) for n in (1, 2, 3, 4)] == [0.1, 0.2, 0.4, 0.5]
+
+    def test_jitter_stays_within_the_backoff_window(self) -> None:
+        """Test that jittered delays never exceed the unjittered delay."""
+        policy = ExponentialBackoffRetryPolicy(base_delay=0.1, rng=random.Random(7))
+
+        assert all(0.0 <= policy.backoff_delay(3) <= 0.4 for _ in range(100))
+
+    def test_retrier_retries_transient_errors_and_sleeps(self) -> None:
+        """Test that transient failures are retried with the policy's delay."""
+        sleeps: List[float] = []
+        retrier = Retrier(FixedRetryPolicy(3, delay=0.25), sleep=sleeps.append)
+        operation = FlakyOperation(2, ConnectionError("db down"))
+
+        assert retrier.call("repository", 3, operation, "ok") == "ok"
+        assert sleeps == [0.25, 0.25]
+        assert retrier.metrics.retries_by_target["repository"] == 2
+
+    def test_retrier_does_not_retry_permanent_errors(self) -> None:
+        """Test that non-retryable errors fail on the first attempt."""
+        retrier = Retrier(FixedRetryPolicy(3))
+        operation = FlakyOperation(1, CanNotUseInTestsException("Service"))
+
+        with pytest.raises(CanNotUseInTestsException):
+            retrier.call("availability", 3, operation, "ok")
+        assert operation.calls == 1
+        assert retrier.metrics.non_retryable_failures == 1
+
+    def test_budget_caps_retries_during_an_outage(self) -> None:
+        """Test that retries are limited to a fraction of requests once the budget is spent."""
+        retrier = Retrier(FixedRetryPolicy(3), RetryBudget(retry_ratio=0.1, max_tokens=2.0))
+
+        attempts = 0
+        for _ in range(100):
+            operation = FlakyOperation(100, TimeoutError("smtp timeout"))
+            with pytest.raises(TimeoutError):
+                retrier.call("partner_notifier", 3, operation, "ok")
+            attempts += operation.calls
+
+        assert retrier.metrics.retries <= 2 + 100 * 0.1
+        assert attempts == 100 + retrier.metrics.retries
+        assert retrier.metrics.budget_exhausted > 0
+
+    def test_coordinators_share_one_budget_unless_given_their_own(self) -> None:
+        """Test that short-lived coordinators draw from the process-wide budget and metrics."""
+        first, second = BookingCoordinatorImpl(), BookingCoordinatorImpl()
+        budget, metrics = RetryBudget(), RetryMetrics()
+        isolated = BookingCoordinatorImpl(retry_budget=budget, retry_metrics=metrics)
+
+        assert first._retrier.budget is second._retrier.budget is get_shared_retry_budget()
+        assert first.retry_metrics is second.retry_metrics is get_shared_retry_metrics()
+        assert isolated._retrier.budget is budget
+        assert isolated.retry_metrics is metrics
+
+    def test_healthy_bookings_leave_the_budget_untouched(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the repository gets the policy's retries and nothing is spent until a retry happens."""
+        repository_retries: List[int] = []
+
+        def recording_create(cls: type) -> Callable[..., object]:
+            factory = create(cls)
+            if cls is not BookingRepositoryImpl:
+                return factory
+            return lambda connection_string, max_retries: (
+                repository_retries.append(max_retries) or factory(connection_string, max_retries)
+            )
+
+        monkeypatch.setattr(booking_coordinator_impl, "create", recording_create)
+        budget, metrics = RetryBudget(max_tokens=2.0), RetryMetrics()
+        with context():
+            set_always(BookingRepositoryImpl, BookingRepositoryStub("AA1230002JOH"))
+            set_always(FlightAvailabilityServiceImpl, FlightAvailabilityServiceStub())
+            set_always(PartnerNotifierImpl, PartnerNotifierStub())
+            set_always(AuditLoggerImpl, AuditLoggerStub())
+            coordinator = BookingCoordinatorImpl(
+                datetime(2025, 6, 1), retry_budget=budget, retry_metrics=metrics
+            )
+            for _ in range(40):
+                coordinator.book_flight("John Smith", "AA123", datetime(2025, 7, 3), 2, "AA")
+
+        assert repository_retries[-1] == BookingCountRetryPolicy().max_retries(41)
+        assert min(repository_retries) >= 1
+        assert budget.available() == 2
+        assert metrics.retries == 0
+
+    def test_coordinator_backs_off_and_never_retries_partner_notification(self) -> None:
+        """Test the coordinator defaults: jittered backoff, no retry of non-idempotent notifications."""
+        notifier = TimingOutNotifier()
+        with context():
+            set_always(BookingRepositoryImpl, BookingRepositoryStub("AA1230002JOH"))
+            set_always(FlightAvailabilityServiceImpl, FlightAvailabilityServiceStub())
+            set_always(PartnerNotifierImpl, notifier)
+            set_always(AuditLoggerImpl, AuditLoggerStub())
+            coordinator = BookingCoordinatorImpl(
+                datetime(2025, 6, 1), retry_budget=RetryBudget(), retry_metrics=RetryMetrics()
+            )
+
+            with pytest.raises(TimeoutError):
+                coordinator.book_flight("John Smith", "AA123", datetime(2025, 7, 3), 2, "AA")
+
+        assert isinstance(coordinator.retry_policy, ExponentialBackoffRetryPolicy)
+        assert notifier.notifications == 1
+        assert coordinator.retry_metrics.retries_by_target["partner_notifier"] == 0
+        assert coordinator.retry_metrics.retries_exhausted == 1
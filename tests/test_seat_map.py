@@ -0,0 +1,231 @@
+"""Tests for the bitset seat map."""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterator, List, Optional, Sequence
+
+import pytest
+from global_object_factory import context, set_always
+
+from legacy_booking.audit_logger_impl import AuditLoggerImpl
+from legacy_booking.booking_coordinator_impl import BookingCoordinatorImpl
+from legacy_booking.booking_repository_impl import BookingRepositoryImpl
+from legacy_booking.flight_availability_service_impl import FlightAvailabilityServiceImpl
+from legacy_booking.partner_notifier_impl import PartnerNotifierImpl
+from legacy_booking.seat_map import SeatMap
+
+from .fakes import (
+    AuditLoggerStub,
+    BookingRepositoryStub,
+    FlightAvailabilityServiceStub,
+    PartnerNotifierStub,
+)
+
+
+def wide_body(rows: int = 4) -> SeatMap:
+    seat_map = SeatMap("ABC DEFG HJK")
+    for row in range(1, rows + 1):
+        seat_map.add_row(row, free=True)
+    return seat_map
+
+
+class SeatMapAvailabilityService(FlightAvailabilityServiceStub):
+    """Knows the cabin layout of the flight and holds reserved seats on it.
+
+    With shared_map=False every call returns a fresh copy, like a remote
+    service would.
+    """
+
+    def __init__(self, seat_map: SeatMap, shared_map: bool = True) -> None:
+        super().__init__()
+        self.seat_map = seat_map
+        self.shared_map = shared_map
+
+    def get_seat_map(self, flight_number: str, departure_date: datetime) -> Optional[SeatMap]:
+        return self.seat_map if self.shared_map else self.seat_map.copy()
+
+    def reserve_seats(
+        self, flight_number: str, departure_date: datetime, seat_labels: Sequence[str]
+    ) -> bool:
+        if not all(self.seat_map.is_free(label) for label in seat_labels):
+            return False
+        for label in seat_labels:
+            self.seat_map.mark_occupied(label)
+        return True
+
+    def release_seats(
+        self, flight_number: str, departure_date: datetime, seat_labels: Sequence[str]
+    ) -> None:
+        for label in seat_labels:
+            self.seat_map.mark_free(label)
+
+
+class RacingAvailabilityService(SeatMapAvailabilityService):
+    """Lets another booking take the first seats this booking picks."""
+
+    def __init__(self, seat_map: SeatMap) -> None:
+        super().__init__(seat_map, shared_map=False)
+        self.lost_seats: List[str] = []
+
+    def reserve_seats(
+        self, flight_number: str, departure_date: datetime, seat_labels: Sequence[str]
+    ) -> bool:
+        if not self.lost_seats:
+            self.lost_seats.append(seat_labels[0])
+            self.seat_map.mark_occupied(seat_labels[0])
+        return super().reserve_seats(flight_number, departure_date, seat_labels)
+
+
+class FailingRepository(BookingRepositoryStub):
+    """Cannot save bookings."""
+
+    def save_booking_details(
+        self, passenger_name: str, flight_details: str, price: Decimal, booking_date: datetime
+    ) -> str:
+        raise ConnectionError("Booking database unavailable")
+
+
+class TestSeatMap:
+    """Test class for SeatMap."""
+
+    def test_group_is_seated_in_one_block(self) -> None:
+        """Test that a group that fits a block gets adjacent seats in one row."""
+        seat_map = wide_body()
+
+        assert seat_map.allocate(4) == ["1D", "1E", "1F", "1G"]
+
+    def test_runs_never_cross_an_aisle(self) -> None:
+        """Test that a group wider than any block is not seated across an aisle."""
+        seat_map = wide_body(rows=2)
+
+        seats = seat_map.allocate(5)
+
+        assert seats == ["1D", "1E", "1F", "1G", "2D"]
+
+    def test_exact_gap_is_preferred_over_first_fit(self) -> None:
+        """Test that a pair fills a two-seat gap rather than breaking up a free block."""
+        seat_map = wide_body(rows=1)
+        for label in ("1C", "1D", "1E"):
+            seat_map.mark_occupied(label)
+
+        assert seat_map.allocate(2) == ["1A", "1B"]
+        assert seat_map.allocate(2) == ["1F", "1G"]
+
+    def test_large_group_uses_fewest_neighbouring_rows(self) -> None:
+        """Test that groups larger than a row are split across neighbouring rows."""
+        seat_map = wide_body(rows=6)
+        for label in ("1A", "2A", "3A", "4A", "5A"):
+            seat_map.mark_occupied(label)
+
+        seats = seat_map.allocate(8)
+
+        assert len(seats) == 8
+        assert {int(seat[:-1]) for seat in seats} == {1, 2}
+
+    def test_scatters_when_no_block_fits(self) -> None:
+        """Test that heavily fragmented maps still seat the group."""
+        seat_map = SeatMap.from_available_seats(["1A", "1C", "3B", "5A"], "ABC", range(1, 6))
+
+        assert seat_map.allocate(4) == ["1A", "1C", "3B", "5A"]
+        assert seat_map.free_count() == 0
+
+    def test_returns_nothing_when_flight_is_too_full(self) -> None:
+        """Test that no seats are taken when the group cannot be seated."""
+        seat_map = SeatMap.from_available_seats(["1A", "1B"], "ABC", range(1, 2))
+
+        assert seat_map.allocate(3) == []
+        assert seat_map.free_count() == 2
+
+    def test_rejects_malformed_labels(self) -> None:
+        """Test that labels not shaped like row number plus letter are refused."""
+        with pytest.raises(ValueError):
+            SeatMap.from_available_seats(["window"], "ABC", range(1, 2))
+        with pytest.raises(ValueError):
+            SeatMap.from_available_seats(["12a"], "ABC", range(1, 20))
+
+    def test_occupied_seat_between_free_seats_breaks_the_run(self) -> None:
+        """Test that free seats either side of a taken one are not treated as adjacent."""
+        seat_map = SeatMap.from_available_seats(["1A", "1C", "2A", "2B"], "ABC", range(1, 3))
+
+        assert seat_map.allocate(2) == ["2A", "2B"]
+
+    def test_full_rows_separate_neighbouring_rows(self) -> None:
+        """Test that a full row in between keeps rows from counting as neighbours."""
+        seat_map = SeatMap.from_available_seats(
+            ["1A", "1B", "3A", "3B", "5A", "5B", "6A", "6B"], "ABC", range(1, 7)
+        )
+
+        seats = seat_map.allocate(4)
+
+        assert {int(seat[:-1]) for seat in seats} == {5, 6}
+
+
+class TestSeatAssignment:
+    """Test class for seat assignment in BookingCoordinatorImpl.book_flight."""
+
+    @pytest.fixture(autouse=True)
+    def services(self) -> Iterator[None]:
+        with context():
+            set_always(BookingRepositoryImpl, BookingRepositoryStub("AA1230002JOH"))
+            set_always(PartnerNotifierImpl, PartnerNotifierStub())
+            set_always(AuditLoggerImpl, AuditLoggerStub())
+            yield
+
+    def book(self, seats: int = 3) -> List[str]:
+        coordinator = BookingCoordinatorImpl(datetime(2025, 6, 1))
+        booking = coordinator.book_flight("John Smith", "AA123", datetime(2025, 7, 3), seats, "AA")
+        return booking.seat_assignments
+
+    def test_groups_seats_when_the_service_provides_a_seat_map(self) -> None:
+        """Test that a known layout seats the party in one block."""
+        seat_map = wide_body(rows=2)
+        for label in ("1B", "1E"):
+            seat_map.mark_occupied(label)
+        set_always(FlightAvailabilityServiceImpl, SeatMapAvailabilityService(seat_map))
+
+        assert self.book() == ["1H", "1J", "1K"]
+
+    def test_falls_back_to_first_free_seats_without_a_layout(self) -> None:
+        """Test that unparseable labels and unknown layouts keep the old count check."""
+        service = FlightAvailabilityServiceStub()
+        service.seats = ["12a", "12c", "14b", "15a"]
+        set_always(FlightAvailabilityServiceImpl, service)
+
+        assert self.book() == ["12a", "12c", "14b"]
+
+        with pytest.raises(ValueError, match="Not enough seats"):
+            self.book(seats=5)
+
+    def test_seats_are_held_with_the_service_not_on_the_returned_map(self) -> None:
+        """Test that two bookings against fresh map copies never share seats."""
+        seat_map = wide_body(rows=2)
+        set_always(FlightAvailabilityServiceImpl, SeatMapAvailabilityService(seat_map, shared_map=False))
+
+        first, second = self.book(), self.book()
+
+        assert not set(first) & set(second)
+        assert seat_map.free_count() == 20 - 6
+
+    def test_seats_lost_to_another_booking_are_picked_again(self) -> None:
+        """Test that a failed reservation fetches the map again instead of double booking."""
+        seat_map = wide_body(rows=2)
+        service = RacingAvailabilityService(seat_map)
+        set_always(FlightAvailabilityServiceImpl, service)
+
+        seats = self.book()
+
+        assert len(service.lost_seats) == 1
+        assert service.lost_seats[0] not in seats
+        assert all(not seat_map.is_free(label) for label in seats)
+        assert seat_map.free_count() == 20 - 4
+
+    def test_seats_are_given_back_when_the_booking_cannot_be_saved(self) -> None:
+        """Test that a booking failing before it is saved does not leak its seats."""
+        seat_map = wide_body(rows=2)
+        set_always(FlightAvailabilityServiceImpl, SeatMapAvailabilityService(seat_map))
+        set_always(BookingRepositoryImpl, FailingRepository())
+
+        with pytest.raises(ConnectionError):
+            self.book()
+
+        assert seat_map.free_count() == 20
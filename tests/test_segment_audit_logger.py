@@ -0,0 +1,75 @@
+"""Tests for the segment-backed audit logger."""
+
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from global_object_factory import context, set_always
+
+from legacy_booking.audit_log_reader import AuditArchiveReader
+from legacy_booking.booking_coordinator_impl import BookingCoordinatorImpl
+from legacy_booking.booking_repository_impl import BookingRepositoryImpl
+from legacy_booking.flight_availability_service_impl import FlightAvailabilityServiceImpl
+from legacy_booking.partner_notifier_impl import PartnerNotifierImpl
+from legacy_booking.segment_audit_logger import AuditSegmentLog, SegmentAuditLogger
+
+from .fakes import BookingRepositoryStub, FlightAvailabilityServiceStub, PartnerNotifierStub
+
+
+class TestSegmentAuditLogger:
+    """Test class for SegmentAuditLogger behind BookingCoordinatorImpl."""
+
+    @pytest.fixture(autouse=True)
+    def services(self, tmp_path: Path) -> Iterator[None]:
+        self.log_directory = str(tmp_path / "logs")
+        self.logger = SegmentAuditLogger(self.log_directory, False, records_per_segment=3)
+        with context():
+            set_always(BookingRepositoryImpl, BookingRepositoryStub("AA1230001JOH"))
+            set_always(FlightAvailabilityServiceImpl, FlightAvailabilityServiceStub())
+            set_always(PartnerNotifierImpl, PartnerNotifierStub())
+            set_always(SegmentAuditLogger, self.logger)
+            self.coordinator = BookingCoordinatorImpl(
+                datetime(2025, 6, 1), audit_logger_type=SegmentAuditLogger
+            )
+            yield
+
+    def test_book_flight_rolls_pricing_records_into_segments(self) -> None:
+        """Test that bookings land in full segments and flushing writes the rest."""
+        for _ in range(7):
+            self.coordinator.book_flight("John Smith", "AA123", datetime(2025, 7, 3), 2, "AA")
+
+        segments = sorted(name for name in os.listdir(self.log_directory) if name.endswith(".seg"))
+        assert segments == ["pricing-000001.seg", "pricing-000002.seg"]
+        assert self.logger.segment_log.pending() == 1
+
+        self.logger.flush_and_archive_logs()
+        records = list(AuditArchiveReader.from_directory(self.log_directory).records(flight_number="AA123"))
+
+        assert len(records) == 7
+        assert all(record.booking_reference == "AA1230001JOH" for record in records)
+        assert records[0].departure_date == datetime(2025, 7, 3)
+        assert self.logger.segment_log.pending() == 0
+
+    def test_activity_is_written_as_text(self) -> None:
+        """Test that booking activity goes to the text activity log."""
+        self.coordinator.book_flight("John Smith", "AA123", datetime(2025, 7, 3), 2, "AA")
+        self.logger.flush_and_archive_logs()
+
+        activity = Path(self.log_directory, "activity.log").read_text(encoding="utf-8")
+        assert "Flight Booked AA1230001JOH: Passenger: John Smith, Flight: AA123" in activity
+
+    def test_new_log_continues_segment_numbering(self) -> None:
+        """Test that a restarted process does not overwrite existing segments."""
+        self.coordinator.book_flight("John Smith", "AA123", datetime(2025, 7, 3), 2, "AA")
+        self.logger.flush_and_archive_logs()
+
+        restarted = AuditSegmentLog(self.log_directory, records_per_segment=1)
+        restarted.append(next(AuditArchiveReader.from_directory(self.log_directory).records()))
+
+        assert sorted(os.listdir(self.log_directory)) == [
+            "activity.log",
+            "pricing-000001.seg",
+            "pricing-000002.seg",
+        ]